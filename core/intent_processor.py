@@ -2,18 +2,23 @@
 import logging
 import importlib
 import os
-import re
-import random
-import speech_recognition as sr
 from pathlib import Path
 import inspect # Added for signature checking
 import spacy # Added for NLP
 from .context_manager import ContextManager # Import ContextManager
-from pathlib import Path
 from .my_custom_nlu import tokenize, NaiveBayesClassifier
 
 logger = logging.getLogger(__name__)
 
+# Components of the base spaCy models whose output nothing reads: plugins only use
+# doc.ents (NER + EntityRuler) and the tagger is kept for the POS-based coreference step.
+# They stay loaded but disabled, so nlp.enable_pipe() can bring them back if needed.
+SPACY_DISABLED_PIPES = ["parser", "lemmatizer"]
+
+# Intents answered by the IntentProcessor itself; their replies never look at entities,
+# so the spaCy pass is skipped for them.
+INTERNAL_INTENTS = frozenset(("INTENT_HELP", "INTENT_CLEAR_CONTEXT", "INTENT_GREET", "INTENT_FAREWELL"))
+
 class IntentProcessor:
     def __init__(self, context_manager: ContextManager, config_manager): # Added config_manager for potential plugin init needs
         """
@@ -137,7 +142,7 @@ class IntentProcessor:
         # Load Spanish Model
         try:
             logger.info(f"Loading BASE Spanish spaCy model (es_core_news_lg)...")
-            self.spacy_nlp_es = spacy.load("es_core_news_lg")
+            self.spacy_nlp_es = spacy.load("es_core_news_lg", disable=SPACY_DISABLED_PIPES)
             logger.info("BASE Spanish spaCy model loaded successfully.")
             
             if self.spacy_nlp_es:
@@ -153,7 +158,7 @@ class IntentProcessor:
         # Load English Model
         try:
             logger.info("Loading BASE English spaCy model (en_core_web_lg)...")
-            self.spacy_nlp_en = spacy.load("en_core_web_lg") # Or "en_core_web_lg"
+            self.spacy_nlp_en = spacy.load("en_core_web_lg", disable=SPACY_DISABLED_PIPES)
             logger.info("BASE English spaCy model loaded successfully.")
 
             if self.spacy_nlp_en:
@@ -227,10 +232,12 @@ class IntentProcessor:
         """Carga dinámicamente los plugins desde el directorio plugins"""
         try:
             plugins_dir = Path(__file__).parent.parent / "plugins"
-            plugin_files = [
-                f for f in os.listdir(plugins_dir) 
-                if f.endswith('.py') and f != '__init__.py' and not f.startswith('.')
-            ]
+            # scandir reports the entry type from the directory listing itself, no extra stat per file
+            with os.scandir(plugins_dir) as entries:
+                plugin_files = [
+                    entry.name for entry in entries
+                    if entry.name.endswith('.py') and not entry.name.startswith(('_', '.')) and entry.is_file()
+                ]
 
             for plugin_file in plugin_files:
                 plugin_name = plugin_file[:-3]  # Quitar la extensión .py
@@ -238,15 +245,58 @@ class IntentProcessor:
                     # Corrected import path for plugins
                     module = importlib.import_module(f"plugins.{plugin_name}")
                     if hasattr(module, 'Plugin'):
-                        self.plugins[plugin_name] = module.Plugin()
+                        # Share our ConfigManager with plugins that accept it instead of letting each build its own
+                        if 'config_manager' in inspect.signature(module.Plugin.__init__).parameters:
+                            self.plugins[plugin_name] = module.Plugin(config_manager=self.config_manager)
+                        else:
+                            self.plugins[plugin_name] = module.Plugin()
                         logger.info(f"Plugin cargado: {plugin_name}")
                 except Exception as e:
                     logger.error(f"Error al cargar plugin {plugin_name}: {str(e)}")
         except Exception as e:
             logger.error(f"Error al cargar plugins: {str(e)}")
 
+    def start_plugins(self):
+        """Arranca el trabajo en segundo plano de los plugins que lo tienen (p.ej. los temporizadores de recordatorios)."""
+        for plugin_name, plugin in self.plugins.items():
+            if hasattr(plugin, 'start'):
+                try:
+                    plugin.start()
+                    logger.info(f"Plugin iniciado: {plugin_name}")
+                except Exception as e:
+                    logger.error(f"Error al iniciar plugin {plugin_name}: {str(e)}")
+
 
-    def process(self, text, lang_hint=None):
+    def _select_nlu(self, lang_hint=None):
+        """Returns (lang, intent classifier, spaCy pipeline) for a language hint; Spanish unless English is requested and available."""
+        if lang_hint == "en" and self.intent_classifier_en and self.spacy_nlp_en:
+            return "en", self.intent_classifier_en, self.spacy_nlp_en
+        return "es", self.intent_classifier_es, self.spacy_nlp_es
+
+    def parse_batch(self, texts, lang_hints, batch_size=64):
+        """
+        Runs spaCy over many utterances at once with nlp.pipe, grouped by language.
+
+        Returns the Docs in input order (None where the language has no pipeline),
+        ready to be passed to process(..., doc=doc).
+        """
+        docs = [None] * len(texts)
+        indices_by_nlp = {}
+        for i, lang_hint in enumerate(lang_hints):
+            _, _, active_spacy_nlp = self._select_nlu(lang_hint)
+            if active_spacy_nlp:
+                indices_by_nlp.setdefault(id(active_spacy_nlp), (active_spacy_nlp, []))[1].append(i)
+        for active_spacy_nlp, indices in indices_by_nlp.values():
+            for i, doc in zip(indices, active_spacy_nlp.pipe((texts[i] for i in indices), batch_size=batch_size)):
+                docs[i] = doc
+        return docs
+
+    def process_batch(self, texts, lang_hints, batch_size=64):
+        """Processes several utterances in order, parsing them with a single batched spaCy pass."""
+        docs = self.parse_batch(texts, lang_hints, batch_size=batch_size)
+        return [self.process(text, lang_hint=lang_hint, doc=doc) for text, lang_hint, doc in zip(texts, lang_hints, docs)]
+
+    def process(self, text, lang_hint=None, doc=None):
         # --- Initialize default return values ---
         final_response_str = "Lo siento, no estoy seguro de cómo ayudarte con eso todavía."
         recognized_intent_label = "UNKNOWN_INTENT"
@@ -256,15 +306,8 @@ class IntentProcessor:
         spacy_doc_entities_for_output = []
 
         # --- 1. Language and NLU Component Selection ---
-        current_lang = "es"
-        active_intent_classifier = self.intent_classifier_es
-        active_spacy_nlp = self.spacy_nlp_es
+        current_lang, active_intent_classifier, active_spacy_nlp = self._select_nlu(lang_hint)
 
-        if lang_hint == "en" and self.intent_classifier_en and self.spacy_nlp_en:
-            current_lang = "en"
-            active_intent_classifier = self.intent_classifier_en
-            active_spacy_nlp = self.spacy_nlp_en
-        
         if not active_intent_classifier or not active_spacy_nlp:
             logger.error("NLU components for the determined language are not available.")
             return {"final_response": "Language components are not available.", "intent_label": "NLU_ERROR"}
@@ -282,13 +325,14 @@ class IntentProcessor:
             recognized_intent_label = "UNKNOWN_INTENT"
 
         # --- 3. SpaCy Linguistic Processing (NO Coreference for now) ---
-        doc = active_spacy_nlp(text)
+        if doc is None and recognized_intent_label not in INTERNAL_INTENTS: # A Doc may come precomputed from parse_batch()
+            doc = active_spacy_nlp(text)
         # The coreference call is the source of an error, let's disable it for now.
         # if self.context_manager:
         #     doc = self._resolve_coreference(doc, self.context_manager.get_context_for_processing())
         
         ruler_entity_labels = {"TIME", "DATE", "PHONE", "WORK_OF_ART", "GPE"}
-        if doc.ents:
+        if doc is not None and doc.ents:
             for ent in doc.ents:
                 source = 'ruler' if ent.label_ in ruler_entity_labels else 'spacy_base_ner'
                 spacy_doc_entities_for_output.append({'text': ent.text, 'label': ent.label_, 'source': source})
@@ -2,7 +2,9 @@
 import logging
 import requests  # Para la llamada a la API de Ollama
 import json  # Para la llamada a la API de Ollama
-from transformers import pipeline, AutoModelForSequenceClassification, AutoTokenizer
+# 'transformers' (y con él PyTorch, ~400 MB de RSS) se importa de forma diferida en
+# AdvancedNLPProcessor.__init__, para que importar este módulo solo por el chat de
+# Ollama o el modelo scikit-learn no cargue los pipelines de Hugging Face.
 
 import os
 import numpy as np
@@ -27,6 +29,15 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Presupuesto de tokens para el historial de chat enviado a Ollama (modelo con contexto de 8k).
+# Se recortan los turnos más antiguos para que el prefijo de la conversación se mantenga
+# estable y Ollama pueda reutilizar su caché KV entre turnos.
+CHAT_HISTORY_TOKEN_BUDGET = 3500
+
+def _estimate_tokens(text: str) -> int:
+    """Estimación barata del número de tokens (~4 caracteres por token)."""
+    return len(text) // 4 + 1
+
 # --- Contenido de core/advanced_nlp.py ---
 class AdvancedNLPProcessor:
     def __init__(self):
@@ -43,6 +54,13 @@ class AdvancedNLPProcessor:
         self.zero_shot_classifier = None
         self.ner_pipeline = None
         # self.text_generator = None # Se eliminará, en su lugar se usará Ollama
+        self.chat_history: list[dict] = [] # Turnos previos user/assistant enviados a Ollama
+
+        try:
+            from transformers import pipeline
+        except ImportError as e:
+            logger.error(f"No se pudo importar 'transformers'; los pipelines de Hugging Face no estarán disponibles: {e}")
+            return
 
         # Inicializar el Pipeline de Análisis de Sentimiento en Inglés
         try:
@@ -191,9 +209,23 @@ class AdvancedNLPProcessor:
             logger.error(f"Error durante la extracción de entidades NER de HF para el texto '{text}': {e}", exc_info=True)
             return []
 
+    def _trim_chat_history(self, query_text: str):
+        """Descarta los pares user/assistant más antiguos hasta que el historial más la consulta quepan en el presupuesto."""
+        total_tokens = _estimate_tokens(query_text) + sum(_estimate_tokens(m["content"]) for m in self.chat_history)
+        while self.chat_history and total_tokens > CHAT_HISTORY_TOKEN_BUDGET:
+            # Eliminar el par más antiguo (user + assistant) para no dejar respuestas huérfanas
+            for _ in range(min(2, len(self.chat_history))):
+                total_tokens -= _estimate_tokens(self.chat_history.pop(0)["content"])
+        logger.debug(f"Historial de chat: {len(self.chat_history)} mensajes, ~{total_tokens} tokens estimados.")
+
+    def clear_chat_history(self):
+        """Olvida la conversación mantenida con Ollama."""
+        self.chat_history.clear()
+
     def generate_chat_response(self, query_text: str, model_tag: str = "llama3.1:8b") -> str:  # Etiqueta de modelo predeterminada actualizada
         """
         Genera una respuesta conversacional utilizando Llama 3 a través de la API de Ollama.
+        Envía también el historial reciente de la conversación, recortado a CHAT_HISTORY_TOKEN_BUDGET.
         Args:
             query_text (str): La entrada del usuario.
             model_tag (str): La etiqueta del modelo Ollama a utilizar (por ejemplo, "llama3:8b-instruct").
@@ -203,11 +235,11 @@ class AdvancedNLPProcessor:
         ollama_api_url = "http://localhost:11434/api/chat"
         logger.debug(f"Enviando consulta a Ollama ({model_tag}): '{query_text}'")
 
+        self._trim_chat_history(query_text)
+        user_message = {"role": "user", "content": query_text}
         payload = {
             "model": model_tag,
-            "messages": [
-                {"role": "user", "content": query_text}
-            ],
+            "messages": self.chat_history + [user_message],
             "stream": False  # Queremos la respuesta completa de una vez
         }
 
@@ -223,6 +255,8 @@ class AdvancedNLPProcessor:
                 if not assistant_response or len(assistant_response) < 5:
                     logger.info(f"Ollama ({model_tag}) generó una respuesta vacía o demasiado corta. Usando fallback.")
                     return "No estoy seguro de cómo responder a eso."
+                self.chat_history.append(user_message)
+                self.chat_history.append({"role": "assistant", "content": assistant_response})
                 return assistant_response
             else:
                 logger.warning(f"Formato de respuesta de Ollama ({model_tag}) inesperado: {response_data}")
@@ -264,7 +298,9 @@ def train_sklearn_command_model():
         X = df["command"]
         y = df["response"]
 
-        model = Pipeline([('vect', CountVectorizer()), ('clf', MultinomialNB())])
+        # int32 counts (int64 by default) halve the sparse matrix memory for this small command corpus
+        vectorizer = CountVectorizer(dtype=np.int32, lowercase=True, strip_accents='unicode', ngram_range=(1, 2))
+        model = Pipeline([('vect', vectorizer), ('clf', MultinomialNB())])
         model.fit(X, y)
         logger.info("Modelo de comando scikit-learn entrenado correctamente.")
         return model
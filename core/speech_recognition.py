@@ -1,46 +1,214 @@
 """
 Módulo para manejar la entrada de voz (Speech Recognition) y fallback de texto.
 """
+import atexit
+import json
 import speech_recognition as sr
 import logging
+from concurrent.futures import ThreadPoolExecutor
 # import os # No se usa directamente en las funciones migradas
 # from dotenv import load_dotenv # No se usa directamente en las funciones migradas
 
-# La importación y uso de Vosk Model y KaldiRecognizer dependerá de si se implementa
-# una función de escucha específica para Vosk. El modelo 'modelo-es'
-# se inicializaba en el archivo original pero no se usaba en 'escuchar()'.
-# from vosk import Model, KaldiRecognizer 
+try:
+    from vosk import Model, KaldiRecognizer
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
-# Si se decide usar un modelo Vosk globalmente, su inicialización iría aquí.
-# try:
-#     vosk_model = Model("modelo-es") # Asegúrate que la ruta al modelo es correcta
-# except Exception as e:
-#     logger.error(f"Error al cargar el modelo Vosk: {e}")
-#     vosk_model = None
+# Modelo acústico local de Vosk. El reconocimiento se hace offline y evita el
+# viaje de ida y vuelta al servicio de Google en cada frase.
+VOSK_MODEL_PATH = "models/vosk-model-small-es"
+VOSK_SAMPLE_RATE = 16000
+VOSK_CHUNK_SIZE = 4000 # Frames por lectura (0.25 s a 16 kHz)
+# Segundos sin cambios en el resultado parcial, tras empezar a hablar, para dar la frase por terminada
+VOSK_SILENCE_SECONDS = 1.0
 
-def escuchar(timeout=5, phrase_time_limit=5):
+def _cargar_modelo_vosk():
+    """Carga el modelo Vosk desde disco. Devuelve None si no se puede cargar."""
+    try:
+        model = Model(VOSK_MODEL_PATH)
+        logger.info(f"Modelo Vosk cargado desde '{VOSK_MODEL_PATH}'.")
+        return model
+    except Exception as e:
+        logger.error(f"Error al cargar el modelo Vosk desde '{VOSK_MODEL_PATH}': {e}")
+        return None
+
+# La carga del modelo tarda varios segundos: se lanza en segundo plano al importar el
+# módulo para que se solape con el resto del arranque (spaCy, TTS, plugins).
+_VOSK_MODEL_FUTURE = None
+if VOSK_AVAILABLE:
+    _vosk_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vosk-loader")
+    _VOSK_MODEL_FUTURE = _vosk_loader.submit(_cargar_modelo_vosk)
+    _vosk_loader.shutdown(wait=False)
+else:
+    logger.warning("Paquete 'vosk' no instalado. Se usará Google Speech Recognition.")
+
+def get_vosk_model():
+    """Devuelve el modelo Vosk (esperando a que termine de cargarse si hace falta), o None si no está disponible."""
+    if _VOSK_MODEL_FUTURE is None:
+        return None
+    return _VOSK_MODEL_FUTURE.result()
+
+# Un único Recognizer por sesión: la calibración de ruido ambiente graba ~1 s
+# de audio, así que se hace una sola vez y se reutiliza su energy_threshold.
+AMBIENT_NOISE_DURATION = 0.8
+_RECOGNIZER = sr.Recognizer()
+_CALIBRATED = False
+
+# El micrófono se abre en la primera escucha y se mantiene abierto entre frases:
+# abrir y cerrar el stream de PortAudio en cada llamada cuesta del orden de 100 ms.
+_MICROPHONE = None
+_MICROPHONE_SOURCE = None
+
+def _abrir_microfono(**kwargs):
+    """Devuelve la fuente de audio abierta, abriéndola la primera vez con los parámetros dados."""
+    global _MICROPHONE, _MICROPHONE_SOURCE
+    if _MICROPHONE_SOURCE is None:
+        _MICROPHONE = sr.Microphone(**kwargs)
+        _MICROPHONE_SOURCE = _MICROPHONE.__enter__()
+        logger.debug("Micrófono abierto.")
+    return _MICROPHONE_SOURCE
+
+def _cerrar_microfono():
+    """Cierra el micrófono si está abierto; la próxima escucha lo volverá a abrir."""
+    global _MICROPHONE, _MICROPHONE_SOURCE
+    if _MICROPHONE is not None:
+        try:
+            _MICROPHONE.__exit__(None, None, None)
+        except Exception as e:
+            logger.error(f"Error al cerrar el micrófono: {e}")
+    _MICROPHONE = None
+    _MICROPHONE_SOURCE = None
+
+atexit.register(_cerrar_microfono)
+
+def _descartar_audio_pendiente(source):
+    """
+    Descarta el audio acumulado en el micrófono desde la última escucha.
+
+    Como el stream sigue abierto entre frases, PortAudio va guardando lo que se oye
+    mientras JARVIS procesa o habla; sin esto la siguiente escucha empezaría por ese audio viejo.
     """
-    Escucha el micrófono y devuelve el texto reconocido usando Google Speech Recognition.
+    try:
+        stream = source.stream.pyaudio_stream
+        pendientes = stream.get_read_available()
+        if pendientes > 0:
+            stream.read(pendientes, exception_on_overflow=False)
+            logger.debug(f"Descartados {pendientes} frames de audio pendientes.")
+    except Exception as e:
+        logger.debug(f"No se pudo descartar el audio pendiente del micrófono: {e}")
+
+def recalibrate():
+    """Fuerza una nueva calibración de ruido ambiente en la próxima escucha (p.ej. si cambia el entorno)."""
+    global _CALIBRATED
+    _CALIBRATED = False
+    logger.info("Se recalibrará el ruido ambiente en la próxima escucha.")
+
+def _escuchar_vosk(model, source, timeout, phrase_time_limit):
+    """
+    Lee el micrófono por bloques y los decodifica con Vosk a medida que llegan.
+
+    El reconocimiento avanza mientras se habla, así que el texto está listo en cuanto
+    Vosk detecta el final de la frase, sin esperar a decodificar toda la grabación.
+    Igual que Recognizer.listen, `timeout` limita la espera hasta que se empieza a hablar
+    y `phrase_time_limit` la duración de la frase; esta termina antes si Vosk da un
+    resultado final o si el parcial no cambia durante VOSK_SILENCE_SECONDS.
+
+    Returns:
+        tuple[str, sr.AudioData]: El texto reconocido (puede ser vacío) y el audio
+        capturado, para poder recurrir a Google si Vosk no reconoce nada.
+
+    Raises:
+        sr.WaitTimeoutError: Si no se empieza a hablar antes de `timeout` segundos.
+    """
+    rec = KaldiRecognizer(model, source.SAMPLE_RATE)
+    seconds_per_chunk = source.CHUNK / source.SAMPLE_RATE
+    frames = []
+    elapsed = 0.0
+    speech_started_at = None # Momento (en segundos de audio) en que apareció el primer parcial
+    last_partial = ""
+    silence = 0.0
+    texto = ""
+    while True:
+        data = source.stream.read(source.CHUNK)
+        frames.append(data)
+        elapsed += seconds_per_chunk
+        if rec.AcceptWaveform(data): # Vosk detectó el final de un segmento
+            texto = json.loads(rec.Result()).get("text", "")
+            if texto or speech_started_at is not None:
+                break
+            # Segmento vacío antes de empezar a hablar (ruido): se sigue esperando
+        else:
+            partial = json.loads(rec.PartialResult()).get("partial", "")
+            if partial != last_partial:
+                last_partial = partial
+                silence = 0.0
+                if partial and speech_started_at is None:
+                    speech_started_at = elapsed
+            elif speech_started_at is not None:
+                silence += seconds_per_chunk
+                if silence >= VOSK_SILENCE_SECONDS:
+                    break
+
+        if speech_started_at is None:
+            if timeout is not None and elapsed >= timeout:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+        elif phrase_time_limit is not None and elapsed - speech_started_at >= phrase_time_limit:
+            break
+
+    if not texto:
+        texto = json.loads(rec.FinalResult()).get("text", "")
+    return texto, sr.AudioData(b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+def escuchar(timeout=5, phrase_time_limit=5, recognize_fallback=True):
+    """
+    Escucha el micrófono y devuelve el texto reconocido.
+
+    Usa el modelo Vosk local si está disponible; en caso contrario (o si Vosk
+    no reconoce nada) recurre a Google Speech Recognition.
     
     Args:
         timeout (int): Tiempo máximo de espera para comenzar a hablar.
         phrase_time_limit (int): Tiempo máximo para una frase.
+        recognize_fallback (bool): Si es True, usa Google Speech Recognition
+            cuando Vosk no está disponible o no reconoce nada.
 
     Returns:
         str or None: El texto reconocido o None si hay un error.
     """
-    recognizer = sr.Recognizer()
+    global _CALIBRATED
+    recognizer = _RECOGNIZER
     try:
-        with sr.Microphone() as source:
+        vosk_model = get_vosk_model()
+        if vosk_model is not None:
+            # Vosk decodifica en streaming a 16 kHz; no necesita la calibración de energía
+            source = _abrir_microfono(sample_rate=VOSK_SAMPLE_RATE, chunk_size=VOSK_CHUNK_SIZE)
+            _descartar_audio_pendiente(source)
+            logger.info("Escuchando (Vosk)...")
+            texto, audio = _escuchar_vosk(vosk_model, source, timeout, phrase_time_limit)
+            if texto:
+                logger.info(f"Texto reconocido (Vosk): {texto}")
+                return texto.lower()
+            logger.info("Vosk no reconoció ningún texto.")
+        else:
+            source = _abrir_microfono()
+            _descartar_audio_pendiente(source)
             # print("Escuchando...") # Se puede manejar en la UI/CLI principal
-            logger.info("Ajustando para ruido ambiente y escuchando...")
-            recognizer.adjust_for_ambient_noise(source) 
+            if not _CALIBRATED:
+                logger.info("Ajustando para ruido ambiente...")
+                recognizer.adjust_for_ambient_noise(source, duration=AMBIENT_NOISE_DURATION)
+                _CALIBRATED = True
+                logger.debug(f"Umbral de energía calibrado: {recognizer.energy_threshold}")
+            logger.info("Escuchando...")
             audio = recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+            logger.info("Procesando audio...")
+            # print("Procesando...") # Se puede manejar en la UI/CLI principal
+
+        if not recognize_fallback:
+            return None
 
-        logger.info("Procesando audio...")
-        # print("Procesando...") # Se puede manejar en la UI/CLI principal
         texto = recognizer.recognize_google(audio, language="es-ES")
         logger.info(f"Texto reconocido: {texto}")
         # print(f"Has dicho: {texto}") # Se puede manejar en la UI/CLI principal
@@ -57,19 +225,11 @@ def escuchar(timeout=5, phrase_time_limit=5):
         # print(f"Error con el servicio de reconocimiento de voz: {e}")
     except Exception as e:
         logger.error(f"Error inesperado en reconocimiento de voz: {e}")
+        _cerrar_microfono() # El stream puede haber quedado inservible; se reabrirá en la próxima escucha
         # print(f"Error inesperado en reconocimiento de voz: {e}")
 
     return None
 
-# def escuchar_vosk(timeout=5, phrase_time_limit=5):
-# """Función de ejemplo si se quisiera usar Vosk"""
-# if vosk_model is None:
-# logger.error("Modelo Vosk no cargado.")
-# return None
-# recognizer = KaldiRecognizer(vosk_model, 16000)
-#     # ... Lógica para escuchar con Vosk ...
-#     pass
-
 def entrada_texto():
     """
     Solicita entrada de texto como alternativa a la voz.
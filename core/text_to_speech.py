@@ -1,8 +1,22 @@
 """
 Módulo para manejar la salida de voz (Text-to-Speech)
 """
-import pyttsx3
+import abc
+import functools
+import hashlib
+import json
+import queue
+import re
+import threading
 import logging
+import os
+from pathlib import Path
+
+try:
+    import simpleaudio
+    SIMPLEAUDIO_AVAILABLE = True
+except ImportError:
+    SIMPLEAUDIO_AVAILABLE = False
 
 logger = logging.getLogger(__name__)  # Get logger at the module level
 
@@ -11,161 +25,434 @@ VOICE_ID_ES = "com.apple.voice.compact.es-MX.Paulina"
 VOICE_ID_EN = "com.apple.voice.compact.en-US.Samantha"
 # --- End Configuration ---
 
-# Iniciar motor de voz
-engine = None
-try:
-    # Configure logger temporarily to see DEBUG messages on console for this run
-    #logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', force=True) # << TEMP for this test  <--- UNCOMMENTED
-    # For regular use, your main.py setup_logging is better.
-    
-    logger.info("Initializing TTS engine...")
-    engine = pyttsx3.init()
-    if engine:
+# JARVIS_TTS_DUMP_VOICES=1 lista todas las voces con sus atributos al iniciar el motor
+TTS_DUMP_VOICES = os.getenv("JARVIS_TTS_DUMP_VOICES", "0") == "1"
+
+# Heurística rápida de idioma para hablar() cuando no se indica lang
+_WORD_RE = re.compile(r"[a-záéíóúüñ']+")
+_SPANISH_MARKS = frozenset("áéíóúüñ¿¡")
+_EN_STOPWORDS = frozenset({"the", "is", "are", "you", "your", "i", "it", "to", "of", "and", "what", "this", "that", "with", "for", "can", "sorry", "please"})
+_ES_STOPWORDS = frozenset({"el", "la", "los", "las", "es", "que", "de", "y", "un", "una", "por", "para", "con", "lo", "no", "tu", "te", "se"})
+# Palabras seguidas mínimas en otro idioma para cambiar de voz a mitad de texto
+TTS_MIN_SEGMENT_WORDS = 3
+
+def _detect_lang(texto: str, default: str = "es") -> str:
+    """
+    Devuelve 'es' o 'en' para `texto`.
+
+    Primero aplica una heurística sin modelo (acentos/ñ/¿¡ y palabras vacías); solo si el
+    texto es ambiguo recurre a langdetect, importado de forma diferida.
+    """
+    lowered = texto.lower()
+    if any(ch in _SPANISH_MARKS for ch in lowered):
+        return "es"
+    words = _WORD_RE.findall(lowered)
+    en_hits = sum(1 for w in words if w in _EN_STOPWORDS)
+    es_hits = sum(1 for w in words if w in _ES_STOPWORDS)
+    if en_hits > es_hits:
+        return "en"
+    if es_hits > en_hits:
+        return "es"
+    try:
+        from langdetect import detect
+        detected = detect(texto)
+        return detected if detected in ("es", "en") else default
+    except Exception:
+        return default
+
+def _segment_by_lang(texto: str, lang: str) -> list:
+    """
+    Divide `texto` en fragmentos consecutivos del mismo idioma: [(lang, fragmento), ...].
+
+    Cada palabra se marca como inglés o español solo si es una palabra vacía o lleva
+    marcas del español; el resto hereda el idioma del tramo en curso, que empieza en `lang`.
+    Los tramos de menos de TTS_MIN_SEGMENT_WORDS palabras se funden con el anterior
+    (o con el siguiente, si es el primero), para que un término suelto no cambie de voz.
+    """
+    runs = []
+    current_lang = lang
+    for word in texto.split():
+        lowered = word.lower().strip(".,;:!?¿¡\"'()")
+        if lowered in _EN_STOPWORDS:
+            current_lang = "en"
+        elif lowered in _ES_STOPWORDS or any(ch in _SPANISH_MARKS for ch in lowered):
+            current_lang = "es"
+        if runs and runs[-1][0] == current_lang:
+            runs[-1][1].append(word)
+        else:
+            runs.append((current_lang, [word]))
+
+    segments = []
+    for run_lang, words in runs:
+        if segments and (len(words) < TTS_MIN_SEGMENT_WORDS or segments[-1][0] == run_lang):
+            segments[-1][1].extend(words)
+        else:
+            segments.append((run_lang, words))
+    if len(segments) > 1 and len(segments[0][1]) < TTS_MIN_SEGMENT_WORDS:
+        first_words = segments.pop(0)[1]
+        segments[0] = (segments[0][0], first_words + segments[0][1])
+    return [(seg_lang, " ".join(words)) for seg_lang, words in segments]
+
+# Separa frases tras '.', '!' o '?' para empezar a hablar antes de sintetizar todo el texto
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Caché en disco de frases fijas ya sintetizadas (saludo inicial, despedidas...).
+# Solo se guardan las frases registradas con registrar_frases_cacheables(): las respuestas
+# variables (horas, clima, recordatorios) casi nunca se repiten y harían crecer la caché sin límite.
+# Solo se activa si 'simpleaudio' está instalado, ya que hace falta para reproducir los WAV.
+TTS_CACHE_DIR = Path("data/tts_cache")
+TTS_CACHE_INDEX = TTS_CACHE_DIR / "index.json"
+TTS_CACHE_MAX_ENTRIES = 32
+TTS_CACHE_MAX_BYTES = 20 * 1024 * 1024
+_cacheable_phrases = set()
+# Índice persistido: {"disabled": bool, "entries": {"<hash>|<lang>": "<archivo>.wav"}}, cargado en el primer uso.
+# 'disabled' se activa si el driver escribe un formato que no se puede reproducir (p. ej. AIFF en macOS/NSSS).
+_wav_cache = None
+
+def registrar_frases_cacheables(*textos: str):
+    """Añade frases fijas a la lista de frases cuyo audio se guarda en la caché de disco."""
+    for texto in textos:
+        if texto:
+            # hablar() encola frase a frase, así que se registran las frases tal como llegarán al caché
+            _cacheable_phrases.update(chunk for chunk in _SENTENCE_SPLIT_RE.split(texto) if chunk)
+
+# Mapa {prefijo de idioma: voice_id}, construido una sola vez al iniciar el motor
+_voice_by_lang = {}
+
+def _build_voice_map(engine):
+    """Completa _voice_by_lang con la primera voz disponible para cada idioma aún sin asignar."""
+    try:
+        for voice in engine.getProperty('voices') or []:
+            for lang_item in (voice.languages or []):
+                # espeak reports languages as bytes prefixed with a priority byte (b'\x05es')
+                if isinstance(lang_item, bytes):
+                    lang_item = lang_item[1:].decode("utf-8", "ignore")
+                prefix = str(lang_item)[:2].lower()
+                _voice_by_lang.setdefault(prefix, voice.id)
+    except Exception as e:
+        logger.error("Error building the language->voice map: %s", e)
+
+class TTSBackend(abc.ABC):
+    """
+    Interfaz mínima de un motor de síntesis de voz.
+
+    Separa el cambio de idioma de la síntesis para que un motor futuro (p.ej. un modelo
+    neuronal) pueda cambiar solo los recursos propios de cada idioma sin recargarse entero.
+    """
+
+    @abc.abstractmethod
+    def set_language(self, lang: str):
+        """Prepara el motor para hablar en `lang`."""
+
+    @abc.abstractmethod
+    def say(self, texto: str):
+        """Sintetiza y reproduce `texto` de forma bloqueante."""
+
+    @abc.abstractmethod
+    def save_to_file(self, texto: str, path: str):
+        """Sintetiza `texto` en un archivo de audio en `path`."""
+
+    def say_segments(self, segments: list):
+        """Reproduce una lista de (lang, fragmento), cambiando de idioma entre fragmentos."""
+        for lang, chunk in segments:
+            self.set_language(lang)
+            self.say(chunk)
+
+
+class Pyttsx3Backend(TTSBackend):
+    """Backend basado en pyttsx3: cambiar de idioma es solo cambiar de voz."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.current_voice_id = engine.getProperty('voice') # Tracked Python-side to avoid driver round-trips
+
+    def set_language(self, lang: str):
+        target_voice_id = _voice_by_lang.get(lang)
+
+        # If no specific voice is found for the target language, use the current engine default.
+        # This avoids unnecessarily trying to set a None voice_id.
+        if not target_voice_id:
+            logger.debug("No specific voice ID for lang '%s'. Using current engine voice: %s", lang, self.current_voice_id)
+        elif target_voice_id != self.current_voice_id:
+            # Drivers apply the new voice on the next say(), so no extra say/runAndWait "latch" is needed.
+            try:
+                logger.debug("Switching TTS voice from %s to %s for language '%s'", self.current_voice_id, target_voice_id, lang)
+                self.engine.setProperty('voice', target_voice_id)
+                self.current_voice_id = target_voice_id
+            except Exception as e:
+                logger.error("Error during voice setting for ID '%s' for lang '%s': %s. Current voice: %s", target_voice_id, lang, e, self.current_voice_id)
+        else: # This means target_voice_id == self.current_voice_id
+            logger.debug("Target voice ID %s is already current. No change needed.", target_voice_id)
+
+    def say(self, texto: str):
+        self.engine.say(texto)
+        self.engine.runAndWait()
+
+    def save_to_file(self, texto: str, path: str):
+        self.engine.save_to_file(texto, path)
+        self.engine.runAndWait()
+
+    def say_segments(self, segments: list):
+        # pyttsx3 queues setProperty and say in order, so voices change inline and one runAndWait plays everything
+        for lang, chunk in segments:
+            self.set_language(lang)
+            self.engine.say(chunk)
+        self.engine.runAndWait()
+
+
+# Motor de voz: se crea de forma perezosa en el hilo de síntesis, normalmente al arrancar
+# la aplicación mediante iniciar_tts() (ver _get_engine)
+
+@functools.lru_cache(maxsize=1)
+def _get_engine():
+    """
+    Inicializa el motor pyttsx3 la primera vez que se necesita y lo reutiliza después.
+
+    Returns:
+        TTSBackend | None: El backend inicializado, o None si falló la inicialización.
+    """
+    try:
+        logger.info("Initializing TTS engine...")
+        import pyttsx3 # Diferido: importar el módulo (p. ej. para detectar idioma) no carga el driver de voz
+        engine = pyttsx3.init()
+        if not engine:
+            logger.error("Falló la inicialización del motor pyttsx3 (engine is None).")
+            return None
         engine.setProperty("rate", 150)  # Set default speaking rate (words per minute)
+
+        # Warm up the backend (SAPI5/NSSpeechSynthesizer/espeak) with an inaudible utterance,
+        # so the first real hablar() doesn't pay the ~1-2 s voice/audio-device initialization.
+        try:
+            default_volume = engine.getProperty("volume")
+            engine.setProperty("volume", 0.0)
+            engine.say(" ")
+            engine.runAndWait()
+            engine.setProperty("volume", default_volume)
+            logger.debug("TTS engine warmed up.")
+        except Exception as e:
+            logger.debug("TTS warm-up skipped: %s", e)
         
         # --- THIS IS THE IMPORTANT PART FOR GETTING VOICE IDs ---
-        voices = engine.getProperty('voices') 
-        logger.info("--- Available TTS Voices (Raw Details) ---") #changed to INFO
-        if voices:
-            for i, voice in enumerate(voices):
-                try:
-                    # On macOS, voice.languages might be a list of strings directly, or needs careful handling
-                    lang_info = voice.languages if voice.languages else "N/A"
-                    logger.info(f"  voice {i}:") 
-                    logger.info(f"    ID: {voice.id}") 
-                    logger.info(f"    Name: {voice.name}")
-                    logger.info(f"    Languages Raw: {lang_info}") # Log the raw attribute
-                    logger.info(f"    Gender: {voice.gender}") 
-                    logger.info(f"    Age: {voice.age}") 
-                    logger.info(f"    ---") 
-                except Exception as e:
-                    logger.error(f"Error inspecting voice {getattr(voice, 'id', 'UNKNOWN_ID')}: {e}")
-        else:
-            logger.warning("No voices found by engine.getProperty('voices')")
+        # Only enumerate voices when debugging: reading every attribute of every voice is slow on NSSS/SAPI5.
+        # Set JARVIS_TTS_DUMP_VOICES=1 to also dump languages/gender/age (needed to pick VOICE_ID_ES/EN).
+        if logger.isEnabledFor(logging.DEBUG) or TTS_DUMP_VOICES:
+            voices = engine.getProperty('voices')
+            if voices:
+                for i, voice in enumerate(voices):
+                    try:
+                        if TTS_DUMP_VOICES:
+                            logger.info("voice %d id=%s name=%s languages=%s gender=%s age=%s",
+                                        i, voice.id, voice.name, voice.languages or "N/A", voice.gender, voice.age)
+                        else:
+                            logger.debug("voice %d id=%s name=%s", i, voice.id, voice.name)
+                    except Exception as e:
+                        logger.error("Error inspecting voice %s: %s", getattr(voice, 'id', 'UNKNOWN_ID'), e)
+            else:
+                logger.warning("No voices found by engine.getProperty('voices')")
         # --- END OF IMPORTANT PART ---
 
-        # The automatic selection loop is unlikely to work well with NSTaggedPointerString
-        # It's better to rely on manually setting VOICE_ID_ES and VOICE_ID_EN above.
-        # We can comment out or remove the automatic selection part for now.
-
-        # logger.info("Attempting automatic voice selection (may not be effective on macOS for language list)...")
-        # for voice in voices: # This loop can be commented out if IDs are hardcoded
-            #if VOICE_ID_ES is None and voice.languages:
-                #try:
-                    # This part is problematic on macOS due to NSTaggedPointerString
-                    # lang_codes = [str(lang_item).lower() for lang_item in voice.languages] # Try direct str conversion
-                    #if any(lc.startswith('es') for lc in lang_codes):
-                        #VOICE_ID_ES = voice.id
-                        #logger.info(f"Automatically selected Spanish voice: {voice.name} (ID: {VOICE_ID_ES})")
-                    #pass # Skip auto-selection based on voice.languages for now
-                #except Exception as e:
-                    #logger.debug(f"Could not parse languages for voice {voice.id}: {voice.languages} - {e}")
-
-        # logger.info("Attempting automatic voice selection (may not be effective on macOS for language list)...")
-        # for voice in voices: # This loop can be commented out if IDs are hardcoded
-            #if VOICE_ID_EN is None and voice.languages:
-                #try:
-                    # This part is problematic on macOS due to NSTaggedPointerString
-                    # lang_codes = [str(lang_item).lower() for lang_item in voice.languages] # Try direct str conversion
-                    #if any(lc.startswith('es') for lc in lang_codes):
-                        #VOICE_ID_EN = voice.id
-                        #logger.info(f"Automatically selected Spanish voice: {voice.name} (ID: {VOICE_ID_EN})")
-                    #pass # Skip auto-selection based on voice.languages for now
-                #except Exception as e:
-                    #logger.debug(f"Could not parse languages for voice {voice.id}: {voice.languages} - {e}")
-
-        if VOICE_ID_ES is None:
-            logger.warning("VOICE_ID_ES is not set. Default voice will be used for Spanish.")
-        else:
-            logger.info(f"Spanish voice ID set to: {VOICE_ID_ES}")
+        # Configured IDs always win; the language->voice map is only built (once) for languages without one,
+        # since reading voice.languages is slow and unreliable on macOS (NSTaggedPointerString).
+        _voice_by_lang.clear()
+        _voice_by_lang.update({lang: vid for lang, vid in (("es", VOICE_ID_ES), ("en", VOICE_ID_EN)) if vid})
+        if len(_voice_by_lang) < 2:
+            _build_voice_map(engine)
 
-        if VOICE_ID_EN is None:
-            logger.warning("VOICE_ID_EN is not set. Default voice will be used for English.")
-        else:
-            logger.info(f"English voice ID set to: {VOICE_ID_EN}")
+        for lang, label in (("es", "Spanish"), ("en", "English")):
+            if lang in _voice_by_lang:
+                logger.info("%s voice ID set to: %s", label, _voice_by_lang[lang])
+            else:
+                logger.warning("No voice found for %s. Default voice will be used.", label)
 
-    else:
-        logger.error("Falló la inicialización del motor pyttsx3 (engine is None).")
-except Exception as e:
-    logger.error(f"Error al inicializar el motor de Text-to-Speech: {e}", exc_info=True)
+        return Pyttsx3Backend(engine)
+    except Exception as e:
+        logger.error("Error al inicializar el motor de Text-to-Speech: %s", e, exc_info=True)
+        return None
 
 
-# +++ MODIFIED hablar function +++
-def hablar(texto: str, lang: str = "es"): # Added lang argument with default "es"
+def _speak_sync(texto: str, lang: str = "es", segment: bool = False):
     """
-    Convierte texto a voz, attempting to use a language-specific voice.
-    
+    Convierte texto a voz de forma bloqueante, attempting to use a language-specific voice.
+    Solo debe llamarse desde el hilo de síntesis (_tts_worker), que es el dueño del motor.
+
     Args:
         texto (str): El texto que se convertirá a voz
         lang (str): The language code ('es' or 'en') for voice selection.
+        segment (bool): Si es True, cambia de voz en los tramos largos en otro idioma.
+            Solo se usa cuando el idioma se detectó automáticamente.
     """
-    if engine is None:
+    backend = _get_engine()
+    if backend is None:
         logger.error("Motor de Text-to-Speech no inicializado. No se puede hablar.")
         return
 
     try:
-        # --- Attempt to set voice based on language ---
-        current_engine_voice_id = engine.getProperty('voice') # Get current voice to revert if needed
-        logger.debug(f"Current engine voice before potential switch: {current_engine_voice_id}")
+        segments = _segment_by_lang(texto, lang) if segment else []
+        if len(segments) > 1:
+            logger.info("Hablando (mixed %s): %s", "/".join(seg_lang for seg_lang, _ in segments), texto)
+            backend.say_segments(segments)
+            return
 
-        target_voice_id = None
-        if lang == "es":
-            target_voice_id = VOICE_ID_ES
-        elif lang == "en": # Fallback to default if no specific Spanish voice is set
-                target_voice_id = VOICE_ID_EN
+        backend.set_language(lang)
+        logger.info("Hablando (lang=%s): %s", lang, texto)
+        if _speak_cached(backend, texto, lang):
+            return
+        backend.say(texto)
+    except Exception as e:
+        logger.error("Error al hablar: %s", e, exc_info=True)
 
-        # If no specific voice is found for the target language, use the current engine default.
-        # This avoids unnecessarily trying to set a None voice_id.
-        if not target_voice_id:
-          logger.debug(f"No specific voice ID for lang '{lang}'. Using current engine voice: {current_engine_voice_id}") # <<< TYPO: debbug -> debug
-          # No need to setProperty if we're using the one that's already there or default for the lang
-        elif target_voice_id != current_engine_voice_id:
-            try:
-                logger.debug(f"Attempting to switch TTS voice to ID: {current_engine_voice_id} to {target_voice_id} for language '{lang}'")
-                engine.setProperty('voice', target_voice_id)
-
-                # +++ ADDED DUMMY SAY AND RUNANDWAIT +++
-                # Only do this if we actually attempted a change.
-                # No need to do it if target_voice_id was already the current_engine_voice_id from the start.
-                logger.debug("Speaking empty string to attempt to latch voice change...")
-                engine.say(" ") # Speak a tiny (or even empty) string
-                engine.runAndWait()
-                # +++++++++++++++++++++++++++++++++++++++
-
-                # Verify the voice AFTER attempting to set and "latch" it
-                new_current_voice_id_after_set = engine.getProperty('voice')
-                if new_current_voice_id_after_set == target_voice_id:
-                    logger.info(f"Successfully set and latched voice property to ID: {target_voice_id} for language '{lang}'")
-                else:
-                    logger.warning(f"Attempted to set voice to {target_voice_id}, but engine reports current voice is {new_current_voice_id_after_set}. Reverting to original.")
-                    # If it didn't stick, or stuck to something else, revert to original for this call
-                    if current_engine_voice_id: # Ensure we have an original ID to revert to
-                        engine.setProperty('voice', current_engine_voice_id)
-                        # It might be good to "latch" the revert too
-                        engine.say(" ") 
-                        engine.runAndWait()
-                    else: # Should not happen if engine is initialized
-                        logger.error("Original engine voice ID was None, cannot revert.")
+def _load_wav_cache():
+    """Carga el índice de la caché de audio desde disco (una sola vez)."""
+    global _wav_cache
+    if _wav_cache is None:
+        _wav_cache = {"disabled": False, "entries": {}}
+        try:
+            with open(TTS_CACHE_INDEX, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and isinstance(data.get("entries"), dict):
+                _wav_cache["disabled"] = bool(data.get("disabled", False))
+                _wav_cache["entries"] = data["entries"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error("Error al leer el índice de la caché de audio '%s': %s", TTS_CACHE_INDEX, e)
+    return _wav_cache
 
-            except Exception as e:
-                logger.error(f"Error during voice setting for ID '{target_voice_id}' for lang '{lang}': {e}. Current voice: {current_engine_voice_id}")
-                # If setProperty itself failed, the voice likely remains current_engine_voice_id
-                # If it changed but then an error occurred, it might be in an intermediate state.
-                # Reverting might be good here too if current_engine_voice_id is known.
-                if current_engine_voice_id:
-                    engine.setProperty('voice', current_engine_voice_id)
+def _save_wav_cache():
+    """Persiste el índice de la caché de audio."""
+    try:
+        TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(TTS_CACHE_INDEX, "w", encoding="utf-8") as f:
+            json.dump(_wav_cache, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        logger.error("Error al guardar el índice de la caché de audio '%s': %s", TTS_CACHE_INDEX, e)
 
-        else: # This means target_voice_id == current_engine_voice_id
-            logger.debug(f"Target voice ID {target_voice_id} is already current. No change needed.")
+def _wav_cache_is_full(entries: dict) -> bool:
+    """True si la caché ya alcanzó el máximo de entradas o de bytes en disco."""
+    if len(entries) >= TTS_CACHE_MAX_ENTRIES:
+        return True
+    total_bytes = 0
+    for name in entries.values():
+        try:
+            total_bytes += (TTS_CACHE_DIR / name).stat().st_size
+        except OSError:
+            pass
+    return total_bytes >= TTS_CACHE_MAX_BYTES
 
-        final_voice_used = engine.getProperty('voice')
-        logger.info(f"Hablando (lang={lang}, voice_id_to_use={final_voice_used}): {texto}")
-        engine.say(texto)
-        engine.runAndWait()
+def _speak_cached(backend, texto: str, lang: str) -> bool:
+    """
+    Reproduce `texto` desde la caché de audio, sintetizándolo a WAV la primera vez.
 
+    Solo se usa para frases registradas con registrar_frases_cacheables().
+
+    Returns:
+        bool: True si se reprodujo desde la caché; False si el llamador debe usar backend.say().
+    """
+    if not SIMPLEAUDIO_AVAILABLE or texto not in _cacheable_phrases:
+        return False
 
+    cache = _load_wav_cache()
+    if cache["disabled"]:
+        return False
+    entries = cache["entries"]
+    key = f"{hashlib.blake2b(texto.encode('utf-8'), digest_size=8).hexdigest()}|{lang}"
+    wav_path = TTS_CACHE_DIR / entries[key] if key in entries else None
+
+    try:
+        if wav_path is None or not wav_path.exists():
+            entries.pop(key, None)
+            if _wav_cache_is_full(entries):
+                return False
+            TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            wav_path = TTS_CACHE_DIR / f"{key.replace('|', '_')}.wav"
+            backend.save_to_file(texto, str(wav_path))
+            # Validate the file before indexing it, so an unplayable format is detected right away
+            wave_obj = simpleaudio.WaveObject.from_wave_file(str(wav_path))
+            entries[key] = wav_path.name
+            _save_wav_cache()
+            logger.debug("Frase sintetizada y guardada en caché: '%s' -> %s", texto, wav_path)
+        else:
+            wave_obj = simpleaudio.WaveObject.from_wave_file(str(wav_path))
+            logger.debug("Frase servida desde la caché de audio: '%s'", texto)
+
+        wave_obj.play().wait_done()
+        return True
     except Exception as e:
-        logger.error(f"Error al hablar: {e}", exc_info=True)
+        # The driver wrote a format the wave module can't read (e.g. AIFF from NSSS on macOS):
+        # disable the cache for good instead of synthesizing every phrase twice on every run.
+        logger.warning("Caché de audio desactivada: no se pudo reproducir '%s': %s", wav_path, e)
+        entries.pop(key, None)
+        cache["disabled"] = True
+        _save_wav_cache()
+        if wav_path is not None:
+            try:
+                wav_path.unlink()
+            except OSError:
+                pass
+        return False
+
+# Cola productor/consumidor: hablar() encola y un único hilo en segundo plano sintetiza,
+# así el bucle principal no queda bloqueado en runAndWait() durante toda la frase.
+_tts_queue = queue.Queue()
+_tts_thread = None
+_tts_thread_lock = threading.Lock()
+
+def _tts_worker():
+    """Hilo consumidor: saca frases de la cola y las reproduce en orden."""
+    while True:
+        item = _tts_queue.get()
+        try:
+            if item is None: # Pedido de iniciar_tts(): crear y calentar el motor sin hablar
+                _get_engine()
+            else:
+                _speak_sync(*item)
+        finally:
+            _tts_queue.task_done()
+
+def _ensure_tts_thread():
+    """Arranca el hilo de síntesis la primera vez que se necesita."""
+    global _tts_thread
+    with _tts_thread_lock:
+        if _tts_thread is None or not _tts_thread.is_alive():
+            _tts_thread = threading.Thread(target=_tts_worker, name="jarvis-tts", daemon=True)
+            _tts_thread.start()
+
+def iniciar_tts():
+    """
+    Arranca el hilo de síntesis e inicializa (y calienta) el motor en segundo plano.
+
+    Debe llamarse al arrancar la aplicación, para que la inicialización se solape con
+    la carga del resto de componentes en lugar de retrasar el primer hablar().
+    El motor se crea en el propio hilo de síntesis, que es quien lo usa después.
+    """
+    _ensure_tts_thread()
+    _tts_queue.put(None)
+
+# +++ MODIFIED hablar function +++
+def hablar(texto: str, lang: str = None):
+    """
+    Encola texto para convertirlo a voz y vuelve inmediatamente.
+
+    Args:
+        texto (str): El texto que se convertirá a voz
+        lang (str): The language code ('es' or 'en') for voice selection.
+            Si es None se detecta a partir del texto (por defecto 'es') y los tramos
+            largos en otro idioma se leen con su propia voz.
+    """
+    segment = lang is None
+    if segment:
+        lang = _detect_lang(texto)
+    _ensure_tts_thread()
+    # Each sentence is queued on its own so the first one starts playing while the rest wait;
+    # the voice switch only happens on the first chunk since the voice id is cached.
+    for chunk in _SENTENCE_SPLIT_RE.split(texto):
+        if chunk:
+            _tts_queue.put((chunk, lang, segment))
+
+def hablar_wait():
+    """Bloquea hasta que se hayan reproducido todas las frases encoladas (p. ej. antes de salir)."""
+    if _tts_thread is not None:
+        _tts_queue.join()
 
 if __name__ == '__main__':
     # This block is just for testing this file directly
@@ -178,17 +465,16 @@ if __name__ == '__main__':
 
 
     logger.info("Running text_to_speech.py directly for testing...")
-    if engine:
-        # --- MANUALLY SET YOUR VOICE IDs HERE FOR TESTING THIS SCRIPT ---
-        # VOICE_ID_ES = "com.apple.voice.compact.es-MX.Paulina" # Example from your logs
-        # VOICE_ID_EN = "com.apple.voice.compact.en-US.Samantha"  # Example from your logs (if available)
-        # logger.info(f"TESTING WITH ES VOICE: {VOICE_ID_ES}")
-        # logger.info(f"TESTING WITH EN VOICE: {VOICE_ID_EN}")
-        # ---------------------------------------------------------------
-
-        hablar("Hola, esto es una prueba en español.", lang="es")
-        hablar("Hello, this is a test in English.", lang="en")
-        hablar("Prueba con el lenguage por defecto") # Should use Spanish default voice
-    else:
-          logger.error("Engine not initialized, cannot run direct test.")
+    # The engine is created lazily inside the TTS thread; hablar() logs an error if it fails to initialize.
+    # --- MANUALLY SET YOUR VOICE IDs HERE FOR TESTING THIS SCRIPT ---
+    # VOICE_ID_ES = "com.apple.voice.compact.es-MX.Paulina" # Example from your logs
+    # VOICE_ID_EN = "com.apple.voice.compact.en-US.Samantha"  # Example from your logs (if available)
+    # logger.info(f"TESTING WITH ES VOICE: {VOICE_ID_ES}")
+    # logger.info(f"TESTING WITH EN VOICE: {VOICE_ID_EN}")
+    # ---------------------------------------------------------------
+
+    hablar("Hola, esto es una prueba en español.", lang="es")
+    hablar("Hello, this is a test in English.", lang="en")
+    hablar("Prueba con el lenguage por defecto") # No lang: detected as Spanish
+    hablar_wait()
     logger.info("text_to_speech.py direct test finished.")
\ No newline at end of file
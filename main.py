@@ -12,6 +12,7 @@ from core.context_manager import ContextManager
 from core.intent_processor import IntentProcessor
 from core.knowledge_manager import KnowledgeManager  # Añadir esta línea
 from ui.cli_interface import start_cli
+from core.text_to_speech import iniciar_tts
 from utils.database_handler import create_connection, create_table, collect_data  # Import database functions
 import json
 from datetime import datetime, timezone
@@ -27,34 +28,35 @@ def main():
     """
     # 0. Initialize Database (Before anything else)
     try:
+        # A single connection and a single transaction (one commit) for table creation and the dummy insert
         conn = create_connection()
         if conn:
-            create_table(conn)
-            conn.close()
-            logger.info("Database initialized successfully.")
+            try:
+                conn.execute("BEGIN")
+                create_table(conn, commit=False)
+                logger.info("Database initialized successfully.")
 
-            # Add some dummy data for testing
-            conn = create_connection()
-            if conn:
-                try:
-                    timestamp = datetime.now(timezone.utc).isoformat()
-                    user_input = "Hola JARVIS"
-                    intent = "greeting"
-                    entities = json.dumps([{"text": "JARVIS", "type": "PERSON"}])
-                    sentiment = json.dumps({"label": "NEU", "score": 0.8})
-                    plugin_used = "IntentProcessorInternal"
-                    response = "Hola! ¿Cómo puedo ayudarte hoy?"
-                    success = 1
-                    language = "es"
+                # Add some dummy data for testing
+                timestamp = datetime.now(timezone.utc).isoformat()
+                user_input = "Hola JARVIS"
+                intent = "greeting"
+                entities = json.dumps([{"text": "JARVIS", "type": "PERSON"}])
+                sentiment = json.dumps({"label": "NEU", "score": 0.8})
+                plugin_used = "IntentProcessorInternal"
+                response = "Hola! ¿Cómo puedo ayudarte hoy?"
+                success = 1
+                language = "es"
 
-                    if collect_data(timestamp, user_input, intent, entities, sentiment, plugin_used, response, success, language):
-                        logger.info("Dummy interaction data saved successfully.")
-                    else:
-                        logger.warning("Failed to save dummy interaction data.")
-                except Exception as e:
-                    logger.error(f"Error adding dummy data: {e}")
-                finally:
-                    conn.close()
+                if collect_data(timestamp, user_input, intent, entities, sentiment, plugin_used, response, success, language, conn=conn, commit=False):
+                    logger.info("Dummy interaction data saved successfully.")
+                else:
+                    logger.warning("Failed to save dummy interaction data.")
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Error adding dummy data: {e}")
+            finally:
+                conn.close()
     except Exception as e:
         logger.critical(f"Error initializing database: {e}", exc_info=True)
         print(f"Error crítico al iniciar la base de datos: {e}. JARVIS no puede continuar.")
@@ -69,6 +71,9 @@ def main():
 
     logger.info("Iniciando JARVIS...")
 
+    # 1.1 Inicializar y calentar el motor de voz en segundo plano, mientras se cargan los modelos NLP
+    iniciar_tts()
+
     # 2. Inicializar el ConfigManager
     # Asume que .env está en la raíz del proyecto y data/app_config.json, data/user_data.json existen.
     try:
@@ -105,6 +110,7 @@ def main():
     try:
         intent_processor = IntentProcessor(context_manager=context_manager, config_manager=config_manager)
         logger.info("IntentProcessor inicializado y plugins cargados.")
+        intent_processor.start_plugins() # Solo la aplicación arma los temporizadores de los plugins, no los tests
     except Exception as e:
         logger.critical(f"Error crítico al inicializar IntentProcessor: {e}", exc_info=True)
         print(f"Error crítico al iniciar el procesador de intenciones: {e}. JARVIS no puede continuar.")
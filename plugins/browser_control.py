@@ -6,6 +6,7 @@ import logging
 import re
 from urllib.parse import quote_plus
 from utils.config_manager import ConfigManager
+from utils.general_utils import get_current_lang
 
 logger = logging.getLogger(__name__)
 
@@ -28,38 +29,48 @@ RESPONSE_TEXTS = {
     }
 }
 
+# Compiled once at import; matches a bare domain like "youtube.com" anywhere in the utterance
+_URL_RE = re.compile(r"([a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)")
+
+_SEARCH_TRIGGERS = (
+    "busca información sobre", "busca en la web", "busca en google", "busca",
+    "googlea acerca de", "googlea",
+    "search the web for", "search for", "search",
+    "google about", "google"
+)
+# Longest first to avoid partial matches; anchored so only a leading trigger phrase is stripped
+_SEARCH_TRIGGER_RE = re.compile(
+    r"^(?:" + "|".join(re.escape(t) for t in sorted(_SEARCH_TRIGGERS, key=len, reverse=True)) + r")\s+",
+    re.IGNORECASE
+)
+
 # --- IMPROVED: More robust helper function ---
 def _extract_search_query(text: str) -> str:
     """Removes common trigger words and phrases to get a clean search query."""
-    text = text.lower() # Work with lowercase
-    triggers = [
-        "busca información sobre", "busca en la web", "busca en google", "busca",
-        "googlea acerca de", "googlea",
-        "search the web for", "search for", "search",
-        "google about", "google"
-    ]
-    # Sort triggers by length, longest first, to avoid partial matches
-    triggers.sort(key=len, reverse=True)
+    # Case-insensitive match, so no lowercased copy is needed and the query keeps the user's casing
+    match = _SEARCH_TRIGGER_RE.match(text)
+    if match:
+        # Return the part of the string that comes after the trigger
+        return text[match.end():].strip()
 
-    for trigger in triggers:
-        # Check if the text starts with the trigger phrase
-        if text.startswith(trigger + " "):
-            # Return the part of the string that comes after the trigger
-            return text[len(trigger):].strip()
-            
     # If no trigger phrase was found at the start, return the original text
     return text.strip()
 
 class Plugin:
-    def __init__(self):
-        self.config_manager = ConfigManager()
+    def __init__(self, config_manager: ConfigManager = None):
+        self.config_manager = config_manager or ConfigManager()
+        # Settings don't change at runtime, so read them once instead of on every request
+        self._default_url = self.config_manager.get_app_setting("browser_default_url", "https://google.com")
+        search_url_template = self.config_manager.get_app_setting("browser_search_url_template", "https://www.google.com/search?q={query}")
+        # Split the template once so building a URL is two concatenations instead of a str.format parse
+        self._search_prefix, _, self._search_suffix = search_url_template.partition("{query}")
         logger.info("Plugin BrowserControl inicializado.")
 
     def get_description(self) -> str:
         return f"{RESPONSE_TEXTS['es']['description']} / {RESPONSE_TEXTS['en']['description']}"
 
     def handle(self, text: str, doc=None, context: dict = None, entities: list = None) -> str:
-        current_lang = context.get('current_conversation_lang', 'es') if context else 'es'
+        current_lang = get_current_lang(context)
         specific_intent = context.get('recognized_intent_for_plugin', '')
         responses = RESPONSE_TEXTS[current_lang]
         
@@ -67,28 +78,27 @@ class Plugin:
         url_to_open = ""
 
         if specific_intent == "INTENT_OPEN_URL":
-            url_match = re.search(r"([a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)", text)
+            url_match = _URL_RE.search(text)
             if url_match:
-                url_to_open = "http://" + url_match.group(1).lower()
-                action_message = responses["opening_url"].format(url=url_match.group(1).lower())
+                domain = url_match.group(1).lower()
+                url_to_open = "http://" + domain
+                action_message = responses["opening_url"].format(url=domain)
             else:
-                url_to_open = self.config_manager.get_app_setting("browser_default_url", "https://google.com")
+                url_to_open = self._default_url
                 action_message = responses["url_not_found"]
 
         elif specific_intent == "INTENT_SEARCH_WEB":
             query = _extract_search_query(text)
             if query:
-                encoded_query = quote_plus(query)
-                search_url_template = self.config_manager.get_app_setting("browser_search_url_template", "https://www.google.com/search?q={query}")
-                url_to_open = search_url_template.format(query=encoded_query)
+                url_to_open = self._search_prefix + quote_plus(query) + self._search_suffix
                 action_message = responses["searching_for"].format(query=query)
             else:
-                url_to_open = self.config_manager.get_app_setting("browser_default_url", "https://google.com")
+                url_to_open = self._default_url
                 action_message = responses["query_not_found"]
         
         else:
             logger.warning(f"BrowserControl plugin handled an unexpected intent: '{specific_intent}'")
-            url_to_open = self.config_manager.get_app_setting("browser_default_url", "https://google.com")
+            url_to_open = self._default_url
             action_message = responses["url_not_found"]
 
         try:
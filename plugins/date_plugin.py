@@ -1,6 +1,7 @@
 # plugins/date_plugin.py
 import logging
 from datetime import date
+from utils.general_utils import get_current_lang
 
 logger = logging.getLogger(__name__)
 
@@ -19,32 +20,39 @@ RESPONSE_TEXTS = {
 }
 # --- END NEW ---
 
+_DAYS_ES = ("lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo")
+_MONTHS_ES = ("enero", "febrero", "marzo", "abril", "mayo", "junio",
+              "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre")
+
 class Plugin:
     def __init__(self):
+        # (date ordinal, {lang: date_str}) -- the formatted date only changes once a day
+        self._cached = (None, {})
         logger.info("Plugin DatePlugin initialized.")
 
     def get_description(self) -> str:
         return f"{RESPONSE_TEXTS['es']['description']} / {RESPONSE_TEXTS['en']['description']}"
 
     def handle(self, text: str, doc=None, context: dict = None, entities: list = None) -> str:
-        current_lang = context.get('current_conversation_lang', 'es') if context else 'es'
+        current_lang = get_current_lang(context)
         responses = RESPONSE_TEXTS[current_lang]
 
         try:
             today = date.today()
-            date_str = ""
-
-            # --- Your excellent localization logic, now inside the new structure ---
-            if current_lang == "es":
-                day_names_es = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
-                month_names_es = ["enero", "febrero", "marzo", "abril", "mayo", "junio", 
-                                  "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"]
-                
-                day_name = day_names_es[today.weekday()]
-                month_name = month_names_es[today.month - 1]
-                date_str = f"{day_name}, {today.day} de {month_name} de {today.year}"
-            else: # English
-                date_str = today.strftime("%A, %B %d, %Y")
+            ordinal = today.toordinal()
+            if self._cached[0] != ordinal:
+                self._cached = (ordinal, {})
+            date_str = self._cached[1].get(current_lang)
+
+            if date_str is None:
+                # --- Your excellent localization logic, now inside the new structure ---
+                if current_lang == "es":
+                    day_name = _DAYS_ES[today.weekday()]
+                    month_name = _MONTHS_ES[today.month - 1]
+                    date_str = f"{day_name}, {today.day} de {month_name} de {today.year}"
+                else: # English
+                    date_str = today.strftime("%A, %B %d, %Y")
+                self._cached[1][current_lang] = date_str
             
             logger.info(f"Responding with the current date: {date_str}")
             return responses["report_date"].format(date_str=date_str)
@@ -2,7 +2,9 @@
 import logging
 import re
 import webbrowser
+from urllib.parse import quote
 from utils.config_manager import ConfigManager
+from utils.general_utils import get_current_lang
 
 logger = logging.getLogger(__name__)
 
@@ -21,45 +23,57 @@ RESPONSE_TEXTS = {
     }
 }
 
+# Compiled once at import; captures whatever follows a play verb, minus a trailing "on Spotify" / "en Spotify"
+_QUERY_RE = re.compile(r"(?:play|reproducir|pon|escuchar)\s+(.+?)(?:\s+(?:on|en)\s+\w+)?$", re.IGNORECASE)
+
+# spaCy entity labels that may name a song, artist or band
+_MUSIC_LABELS = frozenset({"WORK_OF_ART", "PERSON", "ORG"})
+
+# Trigger phrases to remove (in both languages)
+_TRIGGERS = (
+    "la canción", "el artista", "la playlist", "la música de", "música de",
+    "canción", "artista", "playlist",
+    "the song", "the artist", "the playlist", "music by",
+    "song", "artist",
+    "play", "reproducir", "pon", "escuchar", "listen to"
+)
+# Longest first so "la canción" wins over "canción"; anchored so it only strips a leading trigger
+_TRIGGER_RE = re.compile(
+    r"^(?:" + "|".join(re.escape(t) for t in sorted(_TRIGGERS, key=len, reverse=True)) + r")\s+",
+    re.IGNORECASE
+)
+
 # --- NEW: Helper function to clean the query ---
 def _extract_clean_query(text: str) -> str:
     """
     Removes common trigger words and phrases from the beginning of the text
     to get a cleaner search query.
     """
-    # List of trigger phrases to remove (in both languages)
-    triggers = [
-        "la canción", "el artista", "la playlist", "la música de", "música de",
-        "canción", "artista", "playlist",
-        "the song", "the artist", "the playlist", "music by",
-        "song", "artist",
-        "play", "reproducir", "pon", "escuchar", "listen to"
-    ]
-    
-    text_lower = text.lower()
-    # Sort triggers by length, longest first, to avoid partial matches (e.g., "la canción" before "canción")
-    triggers.sort(key=len, reverse=True)
+    match = _TRIGGER_RE.match(text)
+    if match:
+        # Return the original text, but with the trigger part sliced off
+        return text[match.end():].strip()
 
-    for trigger in triggers:
-        if text_lower.startswith(trigger + " "):
-            # Return the original text, but with the trigger part sliced off
-            return text[len(trigger):].strip()
-            
     # If no trigger phrase is found at the start, return the original text
     return text.strip()
 # --- END NEW ---
 
 
 class Plugin:
-    def __init__(self):
-        self.config_manager = ConfigManager()
+    def __init__(self, config_manager: ConfigManager = None):
+        self.config_manager = config_manager or ConfigManager()
+        # Settings don't change at runtime, so read them once instead of on every request
+        search_url_template = self.config_manager.get_app_setting("spotify_search_url_template", "https://open.spotify.com/search/{query}")
+        # Split the template once so building a URL is two concatenations instead of a str.format parse
+        self._search_prefix, _, self._search_suffix = search_url_template.partition("{query}")
+        self._default_url = self.config_manager.get_app_setting("spotify_default_url", "https://open.spotify.com")
         logger.info("Music plugin initialized.")
 
     def get_description(self) -> str:
         return f"{RESPONSE_TEXTS['es']['description']} / {RESPONSE_TEXTS['en']['description']}"
 
     def handle(self, text: str, doc=None, context: dict = None, entities: list = None) -> str:
-        current_lang = context.get('current_conversation_lang', 'es') if context else 'es'
+        current_lang = get_current_lang(context)
         responses = RESPONSE_TEXTS[current_lang]
 
         search_query = None
@@ -67,32 +81,32 @@ class Plugin:
         # 1. Prioritize entities from IntentProcessor
         if entities:
             # Join all music-related entities into a single string
-            full_entity_text = " ".join([ent['text'] for ent in entities if ent['label'] in ["WORK_OF_ART", "PERSON", "ORG"]])
+            full_entity_text = " ".join([ent['text'] for ent in entities if ent['label'] in _MUSIC_LABELS])
             if full_entity_text:
                 # --- MODIFIED: Use the new cleaning function ---
                 search_query = _extract_clean_query(full_entity_text)
-                logger.info(f"Extracted and cleaned query from entities: '{search_query}'")
+                logger.info("Extracted and cleaned query from entities: '%s'", search_query)
 
         # 2. Fallback to regex on the original text if no entities were useful
         if not search_query:
-            match = re.search(r"(?:play|reproducir|pon|escuchar)\s+(.+)", text, re.IGNORECASE)
+            match = _QUERY_RE.search(text)
             if match:
                 raw_query = match.group(1).strip()
                 # --- MODIFIED: Also clean the regex result ---
                 search_query = _extract_clean_query(raw_query)
-                logger.info(f"Extracted and cleaned query using regex fallback: '{search_query}'")
+                logger.info("Extracted and cleaned query using regex fallback: '%s'", search_query)
 
         if search_query:
-            spotify_search_url_template = self.config_manager.get_app_setting("spotify_search_url_template", "https://open.spotify.com/search/{query}")
-            url_to_open = spotify_search_url_template.format(query=search_query)
+            # The query goes into a URL path segment, so percent-encode it (spaces as %20)
+            url_to_open = self._search_prefix + quote(search_query, safe="") + self._search_suffix
             action_message = responses["searching_for"].format(query=search_query)
         else:
             # Generic playback if no query could be found
-            url_to_open = self.config_manager.get_app_setting("spotify_default_url", "https://open.spotify.com")
+            url_to_open = self._default_url
             action_message = responses["opening_spotify"]
 
         try:
-            logger.info(f"{action_message} URL: {url_to_open}")
+            logger.info("%s URL: %s", action_message, url_to_open)
             webbrowser.open(url_to_open)
             return action_message
         except Exception as e:
@@ -3,11 +3,21 @@ Plugin para obtener las últimas noticias.
 """
 import requests
 import logging
+from urllib.parse import urlencode
 from utils.config_manager import ConfigManager
+from utils.ttl_cache import TTLCache
+from utils.http_session import DEFAULT_TIMEOUT, get_shared_session
+from utils.general_utils import json_loads, get_current_lang
 
 logger = logging.getLogger(__name__)
 
 NEWS_API_KEY_NAME = "NEWSAPI_API_KEY"
+NEWS_CACHE_TTL = 900 # Segundos; los titulares cambian en cuestión de minutos
+NEWS_API_BASE_URL = "https://newsapi.org/v2/top-headlines"
+NEWS_PAGE_SIZE = 5 # Titulares que se piden y se leen
+HEADLINE_BULLET = "• "
+NO_TITLE = "No Title"
+NO_SOURCE = "No Source"
 
 # --- NEW: Centralized, bilingual text for all responses ---
 RESPONSE_TEXTS = {
@@ -33,11 +43,29 @@ RESPONSE_TEXTS = {
 # --- END NEW ---
 
 class Plugin:
-    def __init__(self):
-        self.config_manager = ConfigManager()
+    def __init__(self, config_manager: ConfigManager = None):
+        self.config_manager = config_manager or ConfigManager()
         logger.info("Plugin NewsPlugin inicializado.")
-        if not self.config_manager.get_env_variable(NEWS_API_KEY_NAME):
-            logger.warning(f"Environment variable {NEWS_API_KEY_NAME} not found. News plugin may not work.")
+        self._news_api_key = self.config_manager.get_env_variable(NEWS_API_KEY_NAME)
+        if not self._news_api_key:
+            logger.warning("Environment variable %s not found. News plugin may not work.", NEWS_API_KEY_NAME)
+        self._missing_key_logged = False
+        # Country per language is fixed for the session; an override in config (e.g. 'gb') wins
+        self._country_by_lang = {
+            "es": self.config_manager.get_app_setting("news_plugin_country_es", "es"),
+            "en": self.config_manager.get_app_setting("news_plugin_country_en", "us"),
+        }
+        # Full request URL per language, plus a copy with the key masked for logging
+        self._news_urls = {}
+        self._news_urls_log = {}
+        for lang, country in self._country_by_lang.items():
+            query = urlencode({"country": country, "pageSize": NEWS_PAGE_SIZE})
+            self._news_urls[lang] = f"{NEWS_API_BASE_URL}?{query}&{urlencode({'apiKey': self._news_api_key or ''})}"
+            self._news_urls_log[lang] = f"{NEWS_API_BASE_URL}?{query}&apiKey=***"
+        # Process-wide session: keep-alive and TLS session reuse across queries and plugin reloads
+        self._session = get_shared_session()
+        # Successful reports keyed by (lang, country), so repeated questions skip the HTTP call
+        self._cache = TTLCache(maxsize=8, ttl=self.config_manager.get_app_setting("news_cache_ttl", NEWS_CACHE_TTL))
 
     def get_description(self) -> str:
         # --- NEW: Bilingual description ---
@@ -47,53 +75,66 @@ class Plugin:
 
     def handle(self, text: str, doc=None, context: dict = None, entities: list = None) -> str:
         # --- NEW: Determine language from context ---
-        current_lang = "es" # Default to Spanish
-        if context and 'current_conversation_lang' in context:
-            current_lang = context['current_conversation_lang']
+        current_lang = get_current_lang(context)
 
-        # Get the correct set of response texts for the current language
+        return self.get_headlines(current_lang)
+
+    def get_headlines(self, current_lang: str = "es") -> str:
+        """
+        Returns the localized headlines report, using the TTL cache when possible.
+
+        Self-contained and thread-safe, so it can run on a worker thread next
+        to other network lookups instead of serializing the HTTP round-trips.
+        """
         responses = RESPONSE_TEXTS[current_lang]
 
-        news_api_key = self.config_manager.get_env_variable(NEWS_API_KEY_NAME)
-        if not news_api_key:
-            logger.error(f"API key for NewsAPI ({NEWS_API_KEY_NAME}) not configured.")
+        if not self._news_api_key:
+            # Already warned at startup; report it as an error only the first time it's actually needed
+            if not self._missing_key_logged:
+                logger.error("API key for NewsAPI (%s) not configured.", NEWS_API_KEY_NAME)
+                self._missing_key_logged = True
             return responses["api_key_error"]
 
         try:
             # --- NEW: Localize the country for the API call ---
-            country_for_api = "es" if current_lang == "es" else "us"
-            # Allow user to override this in config if they want, e.g., 'gb' for British news
-            country_for_api = self.config_manager.get_app_setting(f"news_plugin_country_{current_lang}", country_for_api)
+            country_for_api = self._country_by_lang[current_lang]
 
-            base_url = "https://newsapi.org/v2/top-headlines?"
-            complete_url = f"{base_url}country={country_for_api}&apiKey={news_api_key}&pageSize=5"
-            
-            logger.debug(f"Querying NewsAPI: {complete_url.replace(news_api_key, '***')}")
-            response = requests.get(complete_url, timeout=10)
+            cache_key = (current_lang, country_for_api)
+            cached_report = self._cache.get(cache_key)
+            if cached_report is not None:
+                logger.info("News headlines served from cache.")
+                return cached_report
+
+            logger.debug("Querying NewsAPI: %s", self._news_urls_log[current_lang])
+            response = self._session.get(self._news_urls[current_lang], timeout=DEFAULT_TIMEOUT)
             response.raise_for_status()
-            news_data = response.json()
+            news_data = json_loads(response.content)
             
             if news_data.get("status") == "ok":
-                articles = news_data.get("articles", [])
+                articles = news_data.get("articles") or ()
                 if not articles:
                     return responses["no_articles"]
                     
                 # Format headlines with their source for better context
-                headlines = [f"• {article.get('title', 'No Title')} - {article.get('source', {}).get('name', 'No Source')}" for article in articles]
+                headlines = (
+                    HEADLINE_BULLET + (article.get('title') or NO_TITLE) + " - " + ((article.get('source') or {}).get('name') or NO_SOURCE)
+                    for article in articles[:NEWS_PAGE_SIZE]
+                )
                 news_report = responses["headlines_intro"] + "\n" + "\n".join(headlines)
                 logger.info("News headlines retrieved successfully.")
+                self._cache.set(cache_key, news_report)
                 return news_report
             else:
                 error_msg = news_data.get("message", "Unknown API error")
-                logger.error(f"News API status error: {error_msg}")
+                logger.error("News API status error: %s", error_msg)
                 return responses["api_status_error"]
                 
         except requests.Timeout:
             logger.error("Timeout while contacting NewsAPI.")
             return responses["timeout_error"]
         except requests.RequestException as e:
-            logger.error(f"Connection error while retrieving news: {e}")
+            logger.error("Connection error while retrieving news: %s", e)
             return responses["connection_error"]
         except Exception as e:
-            logger.error(f"Unexpected error in news plugin: {e}", exc_info=True)
+            logger.error("Unexpected error in news plugin: %s", e, exc_info=True)
             return responses["unexpected_error"]
\ No newline at end of file
@@ -3,11 +3,19 @@ import logging
 import re
 import json
 import os
-from datetime import datetime
-import dateparser
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime, timedelta
+# 'dateparser' (and its locale data) is imported lazily in _parse_time, so loading the
+# plugin doesn't pay for it unless a reminder is actually requested.
+from utils.general_utils import get_current_lang
 
 logger = logging.getLogger(__name__)
 
+REMINDERS_FILE = 'reminders.json'
+
 RESPONSE_TEXTS = {
     "es": {
         "description": "Gestiona recordatorios y alarmas.",
@@ -29,61 +37,137 @@ RESPONSE_TEXTS = {
     }
 }
 
-class Plugin:
+# Trigger phrases stripped from the start of the task, matched with str.startswith
+# on the lowercased task. Longer phrases come first so "recuérdame que" wins over "recuérdame".
+_TRIGGER_PREFIXES = {
+    "es": ("recuérdame que ", "recuérdame ", "avísame que ", "avísame ", "pon una alarma "),
+    "en": ("remind me to ", "remind me ", "set an alarm for "),
+}
+
+# Fast paths for the most common time phrases; anything else falls back to dateparser.
+# "en 10 minutos" / "in 2 hours"
+_RELATIVE_RE = re.compile(
+    r"^(?:en|in)\s+(\d+)\s+(minutos?|minutes?|mins?|horas?|hours?|d[ií]as?|days?)$", re.IGNORECASE
+)
+# "mañana a las 5", "hoy a las 17:30", "tomorrow at 10am", "a las 8"
+_CLOCK_RE = re.compile(
+    r"^(?:(mañana|tomorrow|hoy|today)\s+)?(?:a\s+las?|at)\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)?$",
+    re.IGNORECASE
+)
+_RELATIVE_UNITS = {"m": "minutes", "h": "hours", "d": "days"}
+
+def _fast_parse_time(time_phrase: str, now: datetime):
     """
-    To integrate the reminder checking functionality, you should call the `check_reminders` method
-    of the `Plugin` instance regularly from your main application loop.
+    Parses the common reminder phrasings without dateparser. Returns None when the phrase isn't recognized.
 
-    For example:
+    A bare clock time is always today, even if it has already passed, so the caller can
+    reject it with past_time_error instead of silently moving it to tomorrow.
+    """
+    phrase = time_phrase.strip()
+    match = _RELATIVE_RE.match(phrase)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2).lower()
+        # "horas"/"hours" -> h, "días"/"days" -> d, "minutos"/"minutes"/"mins" -> m
+        return now + timedelta(**{_RELATIVE_UNITS[unit[0]]: amount})
 
-    ```python
-    # In your main application file
-    from plugins.reminders import Plugin as RemindersPlugin
-    import time
+    match = _CLOCK_RE.match(phrase)
+    if match:
+        day_word, hour, minute, meridiem = match.groups()
+        hour, minute = int(hour), int(minute or 0)
+        if meridiem:
+            is_pm = meridiem.lower().startswith("p")
+            hour = hour % 12 + (12 if is_pm else 0)
+        if hour > 23 or minute > 59:
+            return None
+        result = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if day_word and day_word.lower() in ("mañana", "tomorrow"):
+            result += timedelta(days=1)
+        return result
 
-    reminders_plugin = RemindersPlugin()
+    return None
 
-    while True:
-        # Your main application logic here
-        reminders_plugin.check_reminders()
-        time.sleep(1) # Check every second
-    ```
+class Plugin:
+    """
+    Reminders fire on their own once `start()` has been called: a single `threading.Timer`
+    sleeps until the earliest pending reminder and is rescheduled whenever the queue
+    changes, so the main application loop doesn't need to poll `check_reminders`.
+    Constructing the plugin never arms a timer, so tests can use it without side effects.
     """
+    # Specific intent -> handler method name, all called as method(text, doc, lang, intent)
+    _INTENT_HANDLERS = {
+        "INTENT_SET_REMINDER": "_handle_set_reminder",
+        "INTENT_SET_ALARM": "_handle_set_reminder",
+        "INTENT_CANCEL": "_handle_cancel_reminders",
+    }
+
     def __init__(self):
-        self.active_reminders = []
+        # Min-heap of (fire timestamp, sequence, reminder): the next reminder due is always at [0]
+        self._heap = []
+        self._counter = itertools.count() # Tie-breaker so equal timestamps never compare the dicts
+        self._dirty = False # True when the reminders have changes not yet written to disk
+        self._lock = threading.RLock() # The heap is shared between handle() and the timer thread
+        self._timer = None # Single timer armed for the earliest reminder, or None when idle
+        self._started = False # Timers are only armed between start() and stop()
+        self._announce = None # Callable(text, lang) that speaks a due reminder; set by start()
         self.load_reminders()
         logger.info("Plugin Reminders inicializado.")
 
+    def start(self, announce=None):
+        """
+        Starts firing reminders in the background.
+
+        Args:
+            announce: Callable(text, lang) used to speak a due reminder.
+                Defaults to core.text_to_speech.hablar.
+        """
+        if announce is None:
+            from core.text_to_speech import hablar as announce
+        with self._lock:
+            self._announce = announce
+            self._started = True
+            self._reschedule()
+
+    def stop(self):
+        """Cancels the pending timer; reminders stay queued until start() is called again."""
+        with self._lock:
+            self._started = False
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
     def get_description(self) -> str:
         return f"{RESPONSE_TEXTS['es']['description']} / {RESPONSE_TEXTS['en']['description']}"
 
     def handle(self, text: str, doc=None, context: dict = None, entities: list = None) -> str:
-        current_lang = context.get('current_conversation_lang', 'es') if context else 'es'
+        current_lang = get_current_lang(context)
         specific_intent = context.get('recognized_intent_for_plugin', '')
 
-        if specific_intent in ["INTENT_SET_REMINDER", "INTENT_SET_ALARM"]:
-            return self._handle_set_reminder(text, doc, current_lang, specific_intent)
-        elif specific_intent == "INTENT_CANCEL":
-            return self._handle_cancel_reminders(current_lang)
+        method_name = self._INTENT_HANDLERS.get(specific_intent)
+        if method_name:
+            return getattr(self, method_name)(text, doc, current_lang, specific_intent)
 
         return "Internal error in reminder plugin."
 
     def _handle_set_reminder(self, text: str, doc, current_lang: str, specific_intent: str) -> str:
         responses = RESPONSE_TEXTS[current_lang]
-        reminder_time, time_phrase = self._parse_time(doc, current_lang)
+        now = datetime.now() # One clock read per request, shared by parsing and the past-time check
+        reminder_time, time_phrase = self._parse_time(doc, current_lang, now)
 
         if not reminder_time:
             logger.warning(f"All parsing strategies failed for: '{text}'")
             return responses["parse_error"]
 
-        if reminder_time < datetime.now():
+        if reminder_time < now:
             return responses["past_time_error"]
 
         task = self._extract_task(text, time_phrase, current_lang)
 
         reminder = {"task": task, "time": reminder_time.isoformat(), "lang": current_lang}
-        self.active_reminders.append(reminder)
-        self.save_reminders()
+        with self._lock:
+            heapq.heappush(self._heap, (reminder_time.timestamp(), next(self._counter), reminder))
+            self._dirty = True
+            self.save_reminders()
+            self._reschedule()
         
         time_str = reminder_time.strftime("%I:%M %p" if current_lang == 'en' else "%H:%M")
         if specific_intent == "INTENT_SET_ALARM":
@@ -92,13 +176,16 @@ class Plugin:
             date_str = reminder_time.strftime("%x")
             return responses["reminder_set"].format(task=task, date=date_str, time=time_str)
 
-    def _handle_cancel_reminders(self, current_lang: str) -> str:
-        self.active_reminders.clear()
-        self.save_reminders()
+    def _handle_cancel_reminders(self, text: str, doc, current_lang: str, specific_intent: str) -> str:
+        with self._lock:
+            self._heap.clear()
+            self._dirty = True
+            self.save_reminders()
+            self._reschedule()
         logger.info("All pending reminders have been cancelled.")
         return RESPONSE_TEXTS[current_lang]["cancel_success"]
 
-    def _parse_time(self, doc, current_lang: str) -> (datetime, str):
+    def _parse_time(self, doc, current_lang: str, now: datetime) -> (datetime, str):
         time_ents = [ent for ent in doc.ents if ent.label_ in ['TIME', 'DATE']]
         if not time_ents:
             return None, ""
@@ -108,8 +195,11 @@ class Plugin:
         time_phrase = doc.text[start_char:end_char]
         
         logger.info(f"Parsing time phrase: '{time_phrase}'")
-        settings = {'PREFER_DATES_FROM': 'future'}
-        reminder_time = dateparser.parse(time_phrase, languages=[current_lang], settings=settings)
+        reminder_time = _fast_parse_time(time_phrase, now)
+        if reminder_time is None:
+            import dateparser
+            settings = {'PREFER_DATES_FROM': 'future', 'RELATIVE_BASE': now}
+            reminder_time = dateparser.parse(time_phrase, languages=[current_lang], settings=settings)
         
         return reminder_time, time_phrase
 
@@ -120,47 +210,93 @@ class Plugin:
         # 1. Remove the time phrase first.
         task = text.replace(time_phrase, "").strip()
 
-        # 2. Define trigger phrases for both languages.
-        trigger_phrases_es = ["recuérdame que", "recuérdame", "avísame que", "avísame", "pon una alarma"]
-        trigger_phrases_en = ["remind me to", "remind me", "set an alarm for"]
-        
-        # 3. Create a regex pattern to match any of the trigger phrases.
-        if current_lang == 'es':
-            pattern = r"^(" + "|".join(trigger_phrases_es) + r")\s+"
-        else:
-            pattern = r"^(" + "|".join(trigger_phrases_en) + r")\s+"
-            
-        # 4. Remove the trigger phrase from the beginning of the task.
-        task = re.sub(pattern, "", task, flags=re.IGNORECASE).strip()
+        # 2. Remove the trigger phrase from the beginning of the task.
+        lowered = task.lower()
+        for prefix in _TRIGGER_PREFIXES[current_lang]:
+            if lowered.startswith(prefix):
+                task = task[len(prefix):].strip()
+                break
         
-        # 5. Clean up any leading/trailing colons.
+        # 3. Clean up any leading/trailing colons.
         task = task.strip(":")
         
-        # 6. If the task is empty, provide a default.
+        # 4. If the task is empty, provide a default.
         if not task:
             task = "tarea sin especificar" if current_lang == 'es' else "unspecified task"
             
         return task
 
+    @property
+    def active_reminders(self) -> list:
+        """Pending reminders, soonest first."""
+        return [reminder for _, _, reminder in sorted(self._heap)]
+
     def load_reminders(self):
-        if os.path.exists('reminders.json'):
-            with open('reminders.json', 'r') as f:
+        if os.path.exists(REMINDERS_FILE):
+            with open(REMINDERS_FILE, 'r') as f:
                 try:
-                    self.active_reminders = json.load(f)
+                    reminders = json.load(f)
                 except json.JSONDecodeError:
-                    self.active_reminders = []
-                    logger.error("Could not decode reminders from reminders.json")
+                    reminders = []
+                    logger.error(f"Could not decode reminders from {REMINDERS_FILE}")
+            # Parse each ISO time once here instead of on every check_reminders() tick
+            heap = []
+            for r in reminders:
+                try:
+                    heap.append((datetime.fromisoformat(r['time']).timestamp(), next(self._counter), r))
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning(f"Skipping invalid reminder entry in {REMINDERS_FILE}: {r!r} ({e})")
+            heapq.heapify(heap)
+            self._heap = heap
 
     def save_reminders(self):
-        with open('reminders.json', 'w') as f:
-            json.dump(self.active_reminders, f)
+        # Nothing changed since the last write: skip the disk I/O entirely
+        if not self._dirty:
+            return
+        # Write to a temp file and swap it in, so a crash mid-write never leaves a truncated file
+        tmp_path = REMINDERS_FILE + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.active_reminders, f)
+            os.replace(tmp_path, REMINDERS_FILE)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Could not save reminders to {REMINDERS_FILE}: {e}")
 
     def check_reminders(self):
-        now = datetime.now()
-        due_reminders = [r for r in self.active_reminders if datetime.fromisoformat(r['time']) < now]
-        for reminder in due_reminders:
-            # This is where you would trigger the reminder.
-            # For now, we'll just print to the console.
+        """Announces every reminder that is already due. Called by the timer; safe to call directly too."""
+        with self._lock:
+            now_ts = time.time()
+            due = []
+            while self._heap and self._heap[0][0] <= now_ts:
+                due.append(heapq.heappop(self._heap)[2])
+                self._dirty = True
+            self.save_reminders()
+            announce = self._announce
+        if due and announce is None:
+            from core.text_to_speech import hablar as announce
+        for reminder in due:
+            logger.info(f"Reminder due: {reminder['task']}")
             print(f"REMINDER: {reminder['task']}")
-            self.active_reminders.remove(reminder)
-        self.save_reminders()
\ No newline at end of file
+            announce(reminder['task'], reminder.get('lang'))
+
+    def _reschedule(self):
+        """Cancels the pending timer and arms a new one for the earliest reminder, if any."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._started or not self._heap:
+                return
+            delay = max(0.0, self._heap[0][0] - time.time())
+            self._timer = threading.Timer(delay, self._fire_due)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire_due(self):
+        try:
+            self.check_reminders()
+        except Exception as e:
+            logger.error(f"Error firing reminders: {e}", exc_info=True)
+        finally:
+            self._reschedule()
@@ -1,6 +1,7 @@
 # plugins/time_plugin.py
 import logging
 from datetime import datetime
+from utils.general_utils import get_current_lang
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +20,13 @@ RESPONSE_TEXTS = {
 }
 # --- END NEW ---
 
+# Per-language bundle frozen at import: responses plus the clock format
+# (12-hour for English, 24-hour for Spanish)
+LANG_TABLE = {
+    "es": {"time_format": "%H:%M", **RESPONSE_TEXTS["es"]},
+    "en": {"time_format": "%I:%M %p", **RESPONSE_TEXTS["en"]},
+}
+
 class Plugin:
     def __init__(self):
         # The filename is time_plugin.py, so the log message should match.
@@ -28,18 +36,14 @@ class Plugin:
         return f"{RESPONSE_TEXTS['es']['description']} / {RESPONSE_TEXTS['en']['description']}"
 
     def handle(self, text: str, doc=None, context: dict = None, entities: list = None) -> str:
-        current_lang = context.get('current_conversation_lang', 'es') if context else 'es'
-        responses = RESPONSE_TEXTS[current_lang]
+        bundle = LANG_TABLE[get_current_lang(context)]
 
         try:
-            now = datetime.now()
-            # Use the same logic you had: 12-hour for English, 24-hour for Spanish
-            time_format = "%I:%M %p" if current_lang == 'en' else "%H:%M"
-            current_time_str = now.strftime(time_format)
+            current_time_str = datetime.now().strftime(bundle["time_format"])
             
             logger.info(f"Responding with the current time: {current_time_str}")
-            return responses["report_time"].format(time=current_time_str)
+            return bundle["report_time"].format(time=current_time_str)
             
         except Exception as e:
             logger.error(f"Error getting the current time: {e}", exc_info=True)
-            return responses["error"]
\ No newline at end of file
+            return bundle["error"]
\ No newline at end of file
@@ -1,11 +1,26 @@
 # jarvis/plugins/weather.py
 import requests
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
 from utils.config_manager import ConfigManager
+from utils.ttl_cache import TTLCache
+from utils.http_session import DEFAULT_TIMEOUT, get_shared_session
+from utils.general_utils import json_loads, get_current_lang
 
 logger = logging.getLogger(__name__)
 
 WEATHER_API_KEY_NAME = "OPENWEATHER_API_KEY"
+WEATHER_API_BASE_URL = "http://api.openweathermap.org/data/2.5/weather"
+WEATHER_MAX_CITIES = 4 # Cities looked up concurrently in one request ("clima en Madrid y Barcelona")
+WEATHER_CACHE_TTL = 600 # Segundos; el clima no cambia de un minuto a otro
+_LOC_LABELS = frozenset(("GPE", "LOC")) # spaCy entity labels that can name a city
+# Fallback when NER finds no location: "clima en Madrid", "temperature in New York"
+_CITY_RE = re.compile(
+    r"(?:clima|tiempo|temperatura|weather|temperature|forecast)\s+(?:en|de|para|in|for|at)\s+([A-Za-záéíóúüñÁÉÍÓÚÜÑ\s]+)",
+    re.IGNORECASE
+)
 
 # --- NEW: Centralized, bilingual text for all responses ---
 RESPONSE_TEXTS = {
@@ -30,12 +45,31 @@ RESPONSE_TEXTS = {
 }
 # --- END NEW ---
 
+# Per-language OpenWeatherMap parameters, resolved once at import
+# (metric=Celsius for Spanish, imperial=Fahrenheit for English)
+LANG_TABLE = {
+    "es": {"lang_for_api": "es", "units_for_api": "metric", "unit_symbol": "°C"},
+    "en": {"lang_for_api": "en", "units_for_api": "imperial", "unit_symbol": "°F"},
+}
+
 class Plugin:
-    def __init__(self):
-        self.config_manager = ConfigManager()
+    def __init__(self, config_manager: ConfigManager = None):
+        self.config_manager = config_manager or ConfigManager()
         self.api_key = self.config_manager.get_env_variable(WEATHER_API_KEY_NAME)
         if not self.api_key:
-            logger.warning(f"Weather API key ({WEATHER_API_KEY_NAME}) is not set. Plugin may not work.")
+            logger.warning("Weather API key (%s) is not set. Plugin may not work.", WEATHER_API_KEY_NAME)
+        # Fixed query parameters per language (only the city varies), plus a log line with the key masked
+        self._api_params = {}
+        self._url_templates_log = {}
+        for lang, api_params in LANG_TABLE.items():
+            self._api_params[lang] = {"appid": self.api_key, "units": api_params["units_for_api"], "lang": api_params["lang_for_api"]}
+            query = urlencode({"units": api_params["units_for_api"], "lang": api_params["lang_for_api"]})
+            # %-style so the logger only interpolates the city when DEBUG is on
+            self._url_templates_log[lang] = f"Querying OpenWeatherMap: {WEATHER_API_BASE_URL}?q=%s&{query}&appid=***"
+        # Process-wide session: keep-alive connection to OpenWeatherMap across queries and plugin reloads
+        self._session = get_shared_session()
+        # Successful reports keyed by (city, units, lang), so repeated questions skip the HTTP call
+        self._cache = TTLCache(maxsize=256, ttl=self.config_manager.get_app_setting("weather_cache_ttl", WEATHER_CACHE_TTL))
         logger.info("Plugin WeatherPlugin inicializado.")
 
     def get_description(self) -> str:
@@ -45,45 +79,66 @@ class Plugin:
 
     def handle(self, text: str, doc=None, context: dict = None, entities: list = None) -> str:
         # --- NEW: Determine language and get localized texts ---
-        current_lang = context.get('current_conversation_lang', 'es') if context else 'es'
+        current_lang = get_current_lang(context)
         responses = RESPONSE_TEXTS[current_lang]
 
         if not self.api_key:
             return responses["api_key_error"]
 
-        city = None
-        # Prioritize entities to find the city
-        if entities:
-            for ent in entities:
-                if ent['label'] in ["GPE", "LOC"]:
-                    city = ent['text']
-                    logger.info(f"City found in entities: {city}")
-                    break
-        
-        # If still no city, ask the user
-        if not city:
+        # Prioritize entities to find the cities, keeping their order and dropping repeats
+        cities = list(dict.fromkeys(ent['text'] for ent in (entities or ()) if ent['label'] in _LOC_LABELS))
+        if not cities:
+            match = _CITY_RE.search(text)
+            if match and match.group(1).strip():
+                cities = [match.group(1).strip()]
+
+        # If no city, ask the user
+        if not cities:
             logger.info("Could not extract a city from the input.")
             return responses["ask_city"]
+        cities = cities[:WEATHER_MAX_CITIES]
+        logger.info("Cities found: %s", cities)
+
+        if len(cities) == 1:
+            return self.get_weather_report(cities[0], current_lang)
+
+        # Several cities: overlap the HTTP round-trips instead of paying them one after another
+        with ThreadPoolExecutor(max_workers=len(cities)) as executor:
+            reports = executor.map(lambda city: self.get_weather_report(city, current_lang), cities)
+            return "\n".join(reports)
 
-        # --- NEW: Localize API parameters ---
-        lang_for_api = "es" if current_lang == "es" else "en"
-        units_for_api = "metric" if current_lang == "es" else "imperial" # metric=Celsius, imperial=Fahrenheit
-        unit_symbol = "°C" if units_for_api == "metric" else "°F"
+    def get_weather_report(self, city: str, current_lang: str = "es") -> str:
+        """
+        Returns the localized weather report for `city`, using the TTL cache when possible.
+
+        Self-contained and thread-safe, so callers needing several reports
+        (or weather alongside other network lookups) can fan the calls out
+        over a thread pool instead of serializing the HTTP round-trips.
+        """
+        responses = RESPONSE_TEXTS[current_lang]
+
+        api_params = LANG_TABLE[current_lang]
+        # casefold + collapsed whitespace, so "Madrid", "madrid " and "MADRID" share one entry
+        cache_key = (" ".join(city.casefold().split()), api_params["units_for_api"], api_params["lang_for_api"])
+        cached_report = self._cache.get(cache_key)
+        if cached_report is not None:
+            logger.info("Weather report for %s served from cache.", city)
+            return cached_report
 
         try:
-            base_url = "http://api.openweathermap.org/data/2.5/weather?"
-            complete_url = f"{base_url}q={city}&appid={self.api_key}&units={units_for_api}&lang={lang_for_api}"
-            logger.debug(f"Querying OpenWeatherMap: {complete_url.replace(self.api_key, '***')}")
+            logger.debug(self._url_templates_log[current_lang], city)
 
-            response = requests.get(complete_url, timeout=10)
+            response = self._session.get(
+                WEATHER_API_BASE_URL, params={"q": city, **self._api_params[current_lang]}, timeout=DEFAULT_TIMEOUT
+            )
             
             # Check for 404 Not Found specifically
             if response.status_code == 404:
-                logger.warning(f"City not found on OpenWeatherMap: {city}")
+                logger.warning("City not found on OpenWeatherMap: %s", city)
                 return responses["not_found"].format(city=city)
 
             response.raise_for_status() # Handle other errors (4xx, 5xx)
-            weather_data = response.json()
+            weather_data = json_loads(response.content)
 
             main = weather_data.get("main", {})
             temperature = main.get("temp", "N/A")
@@ -98,15 +153,16 @@ class Plugin:
                 desc=weather_description,
                 humidity=humidity
             )
-            logger.info(f"Weather report generated for {city}: {weather_report}")
+            logger.info("Weather report generated for %s: %s", city, weather_report)
+            self._cache.set(cache_key, weather_report)
             return weather_report
 
         except requests.Timeout:
-            logger.error(f"Timeout contacting OpenWeatherMap for {city}.")
+            logger.error("Timeout contacting OpenWeatherMap for %s.", city)
             return responses["timeout_error"]
         except requests.RequestException as e:
-            logger.error(f"Connection error for {city}: {e}")
+            logger.error("Connection error for %s: %s", city, e)
             return responses["connection_error"].format(city=city)
         except Exception as e:
-            logger.error(f"Unexpected error in weather plugin for {city}: {e}", exc_info=True)
+            logger.error("Unexpected error in weather plugin for %s: %s", city, e, exc_info=True)
             return responses["unexpected_error"]
\ No newline at end of file
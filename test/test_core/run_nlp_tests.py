@@ -11,7 +11,13 @@ def test_nlp_evaluation(nlp_suite, test_case_data):
     logger.info("--- Running Test Case: {} ---".format(test_case_data["id"]))
     logger.info("Description: {}".format(test_case_data["description"]))
 
-    for input_data in test_case_data["inputs"]:
+    # Parse every input of the case in one batched spaCy pass
+    docs = nlp_suite.intent_processor.parse_batch(
+        [input_data["text"] for input_data in test_case_data["inputs"]],
+        [input_data["lang"] for input_data in test_case_data["inputs"]],
+    )
+
+    for input_data, doc in zip(test_case_data["inputs"], docs):
         logger.info("Processing lang=\"{}\", text=\"{}\"".format(input_data["lang"], input_data["text"]))
 
         if nlp_suite.intent_processor.context_manager:
@@ -19,7 +25,7 @@ def test_nlp_evaluation(nlp_suite, test_case_data):
             if input_data.get("qa_context"):
                 nlp_suite.intent_processor.context_manager.set_current_turn_data("qa_context_override", input_data["qa_context"])
 
-        processed_output = nlp_suite.intent_processor.process(input_data["text"], lang_hint=input_data["lang"])
+        processed_output = nlp_suite.intent_processor.process(input_data["text"], lang_hint=input_data["lang"], doc=doc)
 
         actual_intent = processed_output.get("intent_label")
         actual_entities = processed_output.get("merged_entities", [])
@@ -36,8 +42,8 @@ def test_nlp_evaluation(nlp_suite, test_case_data):
             "Intent mismatch for {}: Expected {}, Got {}".format(test_case_data["id"], input_data["expected_intent_label"], actual_intent)
 
         # Entity comparison (flexible order)
-        expected_entities_set = set(tuple(e) for e in input_data["expected_entities"])
-        actual_entities_set = set(tuple(e) for e in actual_entities)
+        expected_entities_set = input_data["_expected_entities_fset"]
+        actual_entities_set = frozenset(map(tuple, actual_entities))
         assert expected_entities_set.issubset(actual_entities_set), \
             "Entities mismatch for {}: Expected subset {}, Got {}".format(test_case_data["id"], expected_entities_set, actual_entities_set)
 
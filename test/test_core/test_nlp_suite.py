@@ -1,3 +1,4 @@
+import functools
 import logging
 import sys
 import os
@@ -282,13 +283,23 @@ TEST_CASES = [
     },
 ]
 
+# Hash each input's expected entities once at import instead of on every comparison
+for _test_case in TEST_CASES:
+    for _input_data in _test_case["inputs"]:
+        _input_data["_expected_entities_fset"] = frozenset(map(tuple, _input_data["expected_entities"]))
+
+@functools.lru_cache(maxsize=1)
+def _get_intent_processor():
+    """Builds the IntentProcessor (spaCy models, EntityRuler, classifiers) once per test process."""
+    intent_processor = IntentProcessor(context_manager=MockContextManager(), config_manager=MockConfigManager())
+    logger.info("IntentProcessor initialized with mock managers.")
+    return intent_processor
+
 class NLPEvaluationSuite:
     def __init__(self):
         logger.info("Initializing NLP Evaluation Suite...")
-        mock_config = MockConfigManager()
-        mock_context = MockContextManager()
-        self.intent_processor = IntentProcessor(context_manager=mock_context, config_manager=mock_config)
-        logger.info("IntentProcessor initialized with mock managers.")
+        # Shared across suites; each input clears the context before processing
+        self.intent_processor = _get_intent_processor()
 
     def run_test_case(self, test_case_data):
         logger.info(f"--- Running Test Case: {test_case_data['id']} ---")
@@ -352,9 +363,8 @@ class NLPEvaluationSuite:
 
             # Refined Entity comparison: Check for exact match of (text, label) sets, ignoring order.
             # Extract just (text, label) from actual_entities for comparison
-            actual_entities_set = set(tuple(e) for e in actual_entities)
-            expected_entities_set = set(tuple(e) for e in input_data["expected_entities"])
-            entities_match = actual_entities_set == expected_entities_set
+            actual_entities_set = frozenset(map(tuple, actual_entities))
+            entities_match = actual_entities_set == input_data["_expected_entities_fset"]
 
             sentiment_match = True
             if input_data["expected_sentiment"] is not None:
@@ -0,0 +1,39 @@
+# test_core/test_text_to_speech.py
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from core.text_to_speech import _detect_lang, _segment_by_lang
+
+
+@pytest.mark.parametrize("texto, expected", [
+    ("¿Qué tiempo hace en Madrid?", "es"), # Spanish marks
+    ("Hoy el clima es templado", "es"), # Spanish stopwords
+    ("What is the weather like in London", "en"),
+    ("Sorry, I can't do that", "en"),
+])
+def test_detect_lang_heuristic(texto, expected):
+    assert _detect_lang(texto) == expected
+
+
+def test_segment_by_lang_keeps_single_language_text_whole():
+    texto = "Hoy el clima es templado"
+    assert _segment_by_lang(texto, "es") == [("es", texto)]
+
+
+def test_segment_by_lang_ignores_short_foreign_runs():
+    # A lone "the" must not switch voices mid-sentence
+    assert _segment_by_lang("Pon the playlist de la mañana", "es") == [("es", "Pon the playlist de la mañana")]
+
+
+def test_segment_by_lang_switches_on_long_runs():
+    segments = _segment_by_lang("Estoy reproduciendo la canción what is the name of this song", "es")
+    assert segments == [
+        ("es", "Estoy reproduciendo la canción"),
+        ("en", "what is the name of this song"),
+    ]
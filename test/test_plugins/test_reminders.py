@@ -0,0 +1,113 @@
+# test_plugins/test_reminders.py
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from plugins import reminders
+
+
+@pytest.fixture
+def plugin(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path) # Keep reminders.json.tmp out of the working tree
+    monkeypatch.setattr(reminders, "REMINDERS_FILE", str(tmp_path / "reminders.json"))
+    p = reminders.Plugin()
+    yield p
+    p.stop()
+
+
+def _push(plugin, fire_ts, task):
+    with plugin._lock:
+        reminders.heapq.heappush(plugin._heap, (fire_ts, next(plugin._counter), {"task": task, "lang": "es"}))
+        plugin._dirty = True
+        plugin._reschedule()
+
+
+def test_construction_does_not_arm_a_timer(plugin):
+    _push(plugin, 0, "viejo")
+    assert plugin._timer is None
+
+
+def test_load_skips_invalid_entries(tmp_path, monkeypatch):
+    path = tmp_path / "reminders.json"
+    path.write_text(json.dumps([
+        {"task": "b", "time": "2030-01-02T10:00:00", "lang": "es"},
+        {"task": "sin hora", "lang": "es"},
+        {"task": "mala hora", "time": "mañana", "lang": "es"},
+        {"task": "a", "time": "2030-01-01T10:00:00", "lang": "es"},
+    ]))
+    monkeypatch.setattr(reminders, "REMINDERS_FILE", str(path))
+    p = reminders.Plugin()
+    assert [r["task"] for r in p.active_reminders] == ["a", "b"]
+
+
+def test_heap_keeps_earliest_reminder_first(plugin):
+    _push(plugin, 300, "tercero")
+    _push(plugin, 100, "primero")
+    _push(plugin, 200, "segundo")
+    assert plugin._heap[0][2]["task"] == "primero"
+    assert [r["task"] for r in plugin.active_reminders] == ["primero", "segundo", "tercero"]
+
+
+def test_check_reminders_announces_only_due_ones(plugin, monkeypatch):
+    announced = []
+    monkeypatch.setattr(reminders.time, "time", lambda: 150.0)
+    plugin._announce = lambda text, lang: announced.append((text, lang))
+    _push(plugin, 100, "vencido")
+    _push(plugin, 200, "pendiente")
+    plugin.check_reminders()
+    assert announced == [("vencido", "es")]
+    assert [r["task"] for r in plugin.active_reminders] == ["pendiente"]
+
+
+def test_start_arms_timer_for_earliest_reminder(plugin, monkeypatch):
+    armed = []
+
+    class FakeTimer:
+        def __init__(self, delay, function):
+            self.delay, self.function = delay, function
+            self.cancelled = False
+            armed.append(self)
+
+        def start(self):
+            pass
+
+        def cancel(self):
+            self.cancelled = True
+
+    monkeypatch.setattr(reminders.threading, "Timer", FakeTimer)
+    monkeypatch.setattr(reminders.time, "time", lambda: 1000.0)
+    _push(plugin, 1060, "en un minuto")
+    assert armed == []
+
+    plugin.start(announce=lambda text, lang: None)
+    assert armed[-1].delay == pytest.approx(60)
+
+    _push(plugin, 1010, "antes")
+    assert armed[-2].cancelled
+    assert armed[-1].delay == pytest.approx(10)
+
+    plugin.stop()
+    assert armed[-1].cancelled
+    assert plugin._timer is None
+
+
+def test_timer_fires_and_announces(plugin):
+    fired = threading.Event()
+    announced = []
+
+    def announce(text, lang):
+        announced.append(text)
+        fired.set()
+
+    plugin.start(announce=announce)
+    _push(plugin, reminders.time.time() + 0.05, "ya")
+    assert fired.wait(timeout=2)
+    assert announced == ["ya"]
+    assert plugin.active_reminders == []
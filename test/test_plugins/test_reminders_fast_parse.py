@@ -0,0 +1,67 @@
+# test_plugins/test_reminders_fast_parse.py
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from plugins.reminders import _fast_parse_time
+
+NOW = datetime(2024, 5, 10, 18, 0, 0)
+
+
+@pytest.mark.parametrize("phrase, expected", [
+    ("en 10 minutos", NOW + timedelta(minutes=10)),
+    ("en 1 minuto", NOW + timedelta(minutes=1)),
+    ("en 2 horas", NOW + timedelta(hours=2)),
+    ("en 3 días", NOW + timedelta(days=3)),
+    ("in 5 minutes", NOW + timedelta(minutes=5)),
+    ("in 1 hour", NOW + timedelta(hours=1)),
+    ("in 2 days", NOW + timedelta(days=2)),
+])
+def test_relative_phrases(phrase, expected):
+    assert _fast_parse_time(phrase, NOW) == expected
+
+
+@pytest.mark.parametrize("phrase, expected", [
+    # 24h, Spanish
+    ("a las 20", datetime(2024, 5, 10, 20, 0)),
+    ("a las 19:45", datetime(2024, 5, 10, 19, 45)),
+    ("hoy a las 21:30", datetime(2024, 5, 10, 21, 30)),
+    ("mañana a las 5", datetime(2024, 5, 11, 5, 0)),
+    ("a la 1 pm", datetime(2024, 5, 10, 13, 0)),
+    # 12h, English
+    ("at 10pm", datetime(2024, 5, 10, 22, 0)),
+    ("at 7:15 p.m.", datetime(2024, 5, 10, 19, 15)),
+    ("tomorrow at 10am", datetime(2024, 5, 11, 10, 0)),
+    ("tomorrow at 12am", datetime(2024, 5, 11, 0, 0)),
+    ("today at 12pm", datetime(2024, 5, 10, 12, 0)),
+])
+def test_clock_phrases(phrase, expected):
+    assert _fast_parse_time(phrase, NOW) == expected
+
+
+@pytest.mark.parametrize("phrase", ["a las 8", "a las 17:59", "at 9am", "today at 3 pm"])
+def test_past_clock_time_is_not_moved_to_tomorrow(phrase):
+    result = _fast_parse_time(phrase, NOW)
+    assert result is not None
+    assert result.date() == NOW.date()
+    assert result < NOW
+
+
+@pytest.mark.parametrize("phrase", [
+    "el próximo martes",
+    "next tuesday",
+    "2024-05-11T10:00:00",
+    "2024-05-11",
+    "a las 25",
+    "at 10:75",
+    "en unos minutos",
+    "",
+])
+def test_unrecognized_phrases_fall_through(phrase):
+    assert _fast_parse_time(phrase, NOW) is None
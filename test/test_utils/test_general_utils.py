@@ -0,0 +1,27 @@
+# test_utils/test_general_utils.py
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils.general_utils import get_current_lang
+
+
+@pytest.mark.parametrize("context, expected", [
+    ({"current_conversation_lang": "en"}, "en"),
+    ({"current_conversation_lang": "es"}, "es"),
+    ({"current_conversation_lang": "fr"}, "es"), # Unsupported language
+    ({}, "es"),
+    (None, "es"),
+])
+def test_get_current_lang(context, expected):
+    assert get_current_lang(context) == expected
+
+
+def test_get_current_lang_custom_default():
+    assert get_current_lang(None, default="en") == "en"
+    assert get_current_lang({"current_conversation_lang": "de"}, default="en") == "en"
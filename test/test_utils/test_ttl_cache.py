@@ -0,0 +1,69 @@
+# test_utils/test_ttl_cache.py
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils import ttl_cache
+from utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cache_with_clock(monkeypatch, **kwargs):
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", clock)
+    return TTLCache(**kwargs), clock
+
+
+def test_get_returns_value_within_ttl(monkeypatch):
+    cache, clock = _cache_with_clock(monkeypatch, ttl=60)
+    cache.set("madrid", {"temp": 21})
+    clock.now += 59
+    assert cache.get("madrid") == {"temp": 21}
+
+
+def test_entry_expires_after_ttl(monkeypatch):
+    cache, clock = _cache_with_clock(monkeypatch, ttl=60)
+    cache.set("madrid", {"temp": 21})
+    clock.now += 60
+    assert cache.get("madrid") is None
+    assert cache.get("madrid", "missing") == "missing"
+    assert len(cache) == 0
+
+
+def test_set_refreshes_expiry(monkeypatch):
+    cache, clock = _cache_with_clock(monkeypatch, ttl=60)
+    cache.set("madrid", 1)
+    clock.now += 50
+    cache.set("madrid", 2)
+    clock.now += 50
+    assert cache.get("madrid") == 2
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    cache, _ = _cache_with_clock(monkeypatch, maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1 # 'a' is now the most recently used
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_clear_empties_the_cache(monkeypatch):
+    cache, _ = _cache_with_clock(monkeypatch)
+    cache.set("a", 1)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("a") is None
@@ -115,8 +115,7 @@ TRAIN_DATA_EN_TEXTCAT = [
 def train_textcat_model(lang, train_data, all_intent_labels, output_dir, model_name=None, base_model=None, epochs=NUM_TRAIN_EPOCHS):
     """Trains a new spaCy textcat model or updates an existing one."""
     output_dir = Path(output_dir)
-    if not output_dir.exists():
-        output_dir.mkdir(parents=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     if model_name and (output_dir / model_name).exists():
         print(f"Loading existing model for language '{lang}' from {output_dir / model_name} for incremental update.")
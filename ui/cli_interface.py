@@ -3,13 +3,16 @@ Módulo para la interfaz de línea de comandos (CLI) de JARVIS.
 """
 import logging
 from datetime import datetime, timezone
-from core.text_to_speech import hablar
+from core.text_to_speech import hablar, hablar_wait, registrar_frases_cacheables
 from utils.database_handler import collect_data # Para guardar interacciones
 import json # needed for json.dumps for database_handler
 from langdetect import detect, LangDetectException
 
 logger = logging.getLogger(__name__)
 
+# Comandos de salida (comparados en minúsculas); un frozenset da una sola búsqueda O(1) por entrada
+EXIT_COMMANDS = frozenset({"exit", "quit", "bye", "salir", "adiós", "adios", "chao", "terminar"})
+
 def start_cli(intent_processor, context_manager, config_manager):
     """
     Inicia la interfaz de línea de comandos para interactuar con JARVIS.
@@ -22,6 +25,13 @@ def start_cli(intent_processor, context_manager, config_manager):
     logger.info("Iniciando CLI de JARVIS...")
     
     initial_greeting = config_manager.get_app_setting("initial_greeting", "Hola, soy JARVIS. ¿Cómo puedo ayudarte hoy?")
+    farewell_message_parts = {
+        "es": config_manager.get_app_setting("farewell_message_es", "¡Adiós!"),
+        "en": config_manager.get_app_setting("farewell_message_en", "Goodbye!")
+    }
+    # Fixed prompts spoken every session: the only phrases worth keeping in the TTS audio cache
+    registrar_frases_cacheables(initial_greeting, *farewell_message_parts.values())
+
     print(f"JARVIS: {initial_greeting}")
     hablar(initial_greeting)
 
@@ -34,7 +44,8 @@ def start_cli(intent_processor, context_manager, config_manager):
     while True:
         cli_prompt_template = config_manager.get_app_setting("cli_prompt_template", "Tú ({lang}): ") # Use a template
         actual_prompt = cli_prompt_template.format(lang=current_session_lang.upper())
-        
+
+        hablar_wait() # Don't take the next command while JARVIS is still speaking the previous reply
         user_input_raw = input(actual_prompt)
         if user_input_raw is None: 
             logger.info("Entrada de usuario es None (EOF), saliendo.")
@@ -46,14 +57,11 @@ def start_cli(intent_processor, context_manager, config_manager):
             continue
 
         # Exit commands check (using the raw input text to catch mixed case)
-        if user_input_text.lower() in ["exit", "quit", "bye", "salir", "adiós", "chao"]:
-            farewell_message_parts = {
-                "es": config_manager.get_app_setting("farewell_message_es", "¡Adiós!"),
-                "en": config_manager.get_app_setting("farewell_message_en", "Goodbye!")
-            }
+        if user_input_text.lower() in EXIT_COMMANDS:
             farewell_message = farewell_message_parts.get(current_session_lang, farewell_message_parts["es"])
             print(f"JARVIS: {farewell_message}")
             hablar(farewell_message, lang=current_session_lang)
+            hablar_wait() # Let the farewell finish before the daemon TTS thread dies with the process
             logger.info("Saliendo de la CLI de JARVIS.")
             if context_manager:
                 context_manager.add_utterance('user', user_input_text, intent="exit_command", language=current_session_lang)
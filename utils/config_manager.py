@@ -6,6 +6,7 @@ import os
 import logging
 from dotenv import load_dotenv
 from pathlib import Path
+from utils.general_utils import json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,7 @@ class ConfigManager:
         self.app_config_path = self.project_root / "data" / "application_config.json"
         self.user_data_path = self.project_root / "data" / "runtime_data.json"
 
+        self._env_cache = {} # Variables de entorno ya consultadas (incluidas las ausentes, como None)
         self._load_env()
         self.app_config = self._load_json_config(self.app_config_path, "Application Configuration")
         self.user_data = self._load_json_config(self.user_data_path, "User Data")
@@ -42,6 +44,7 @@ class ConfigManager:
 
     def _load_env(self):
         """Carga variables de entorno desde el archivo .env en la raíz del proyecto."""
+        self._env_cache.clear() # Recargar el .env invalida los valores ya consultados
         if self.env_path.exists():
             load_dotenv(dotenv_path=self.env_path, override=True)
             logger.info(f"Variables de entorno cargadas desde: {self.env_path}")
@@ -52,14 +55,14 @@ class ConfigManager:
     def _load_json_config(self, path: Path, config_name: str) -> dict:
         """Carga configuración desde un archivo JSON."""
         try:
-            with open(path, "r", encoding='utf-8') as f:
-                config = json.load(f)
+            with open(path, "rb") as f:
+                config = json_loads(f.read())
                 logger.info(f"'{config_name}' cargado exitosamente desde '{path}'.")
                 return config
         except FileNotFoundError:
             logger.warning(f"Archivo de '{config_name}' no encontrado en '{path}'. Se retorna configuración vacía.")
             return {}
-        except json.JSONDecodeError:
+        except ValueError: # json.JSONDecodeError y orjson.JSONDecodeError derivan de ValueError
             logger.error(f"Error decodificando JSON del archivo '{config_name}' en '{path}'. Se retorna configuración vacía.")
             return {}
         except Exception as e:
@@ -67,8 +70,12 @@ class ConfigManager:
             return {}
 
     def get_env_variable(self, var_name: str, default=None):
-        """Obtiene una variable de entorno."""
-        return os.getenv(var_name, default)
+        """Obtiene una variable de entorno. El valor se memoriza tras la primera consulta."""
+        try:
+            value = self._env_cache[var_name]
+        except KeyError:
+            value = self._env_cache[var_name] = os.getenv(var_name)
+        return default if value is None else value
 
     def get_app_setting(self, key: str, default=None):
         """Obtiene un ajuste de la configuración de la aplicación (app_config.json)."""
@@ -96,20 +103,33 @@ class ConfigManager:
 # config_manager = ConfigManager()
 
 # También se puede mantener una función similar a la original si se necesita cargar JSONs arbitrarios:
+# Archivos JSON ya leídos por load_json_file: ruta -> (mtime_ns, datos)
+_json_file_cache = {}
+
 def load_json_file(file_path: str, description: str = "JSON file") -> dict:
-    """Carga un archivo JSON desde una ruta específica."""
+    """
+    Carga un archivo JSON desde una ruta específica.
+
+    El resultado se memoriza junto con la fecha de modificación del archivo: mientras no
+    cambie en disco, las llamadas siguientes no vuelven a leerlo ni a decodificarlo.
+    El diccionario devuelto es compartido, así que no debe modificarse.
+    """
     path_obj = Path(file_path)
     try:
-        with open(path_obj, "r", encoding='utf-8') as f:
-            data = json.load(f)
-            logger.info(f"'{description}' cargado desde '{path_obj}'.")
-            return data
+        mtime_ns = os.stat(path_obj).st_mtime_ns
+        cached = _json_file_cache.get(str(path_obj))
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        data = json_loads(path_obj.read_bytes())
+        _json_file_cache[str(path_obj)] = (mtime_ns, data)
+        logger.info(f"'{description}' cargado desde '{path_obj}'.")
+        return data
     except FileNotFoundError:
         logger.warning(f"Archivo '{description}' no encontrado en '{path_obj}'.")
         return {}
-    except json.JSONDecodeError:
+    except ValueError: # json.JSONDecodeError y orjson.JSONDecodeError derivan de ValueError
         logger.error(f"Error decodificando JSON de '{description}' en '{path_obj}'.")
         return {}
     except Exception as e:
         logger.error(f"Error cargando '{description}' desde '{path_obj}': {e}.")
-        return {}
+        return {}
\ No newline at end of file
@@ -15,16 +15,19 @@ def create_connection():
     """Creates a database connection to the SQLite database."""
     conn = None
     try:
-        # Ensure the 'data' directory exists
-        Path("data").mkdir(parents=True, exist_ok=True)
+        # Ensure the database directory exists (a single race-free syscall, no exists() check)
+        Path(DATABASE_PATH).parent.mkdir(parents=True, exist_ok=True)
         conn = sqlite3.connect(DATABASE_PATH)
         logger.info(f"Connection to SQLite database successful: {DATABASE_PATH}")
-    except sqlite3.Error as e:
+    except (sqlite3.Error, OSError) as e:
         logger.error(f"Error connecting to SQLite database: {e}")
     return conn
 
-def create_table(conn):
-    """Creates the 'interactions' table if it doesn't exist."""
+def create_table(conn, commit=True):
+    """
+    Creates the 'interactions' table if it doesn't exist.
+    With commit=False the caller commits, so it can batch this with other writes.
+    """
     try:
         sql_create_interactions_table = """
         CREATE TABLE IF NOT EXISTS interactions (
@@ -42,16 +45,21 @@ def create_table(conn):
         """
         cursor = conn.cursor()
         cursor.execute(sql_create_interactions_table)
-        conn.commit()
+        if commit:
+            conn.commit()
         logger.info("Interactions table created successfully or already exists.")
     except sqlite3.Error as e:
         logger.error(f"Error creating interactions table: {e}")
 
-def collect_data(timestamp, user_input, intent, entities, sentiment, plugin_used, response, success, language):
+def collect_data(timestamp, user_input, intent, entities, sentiment, plugin_used, response, success, language, conn=None, commit=True):
     """
     Saves interaction data to the SQLite database.
+    If `conn` is given it is reused (and left open); otherwise a connection is opened and closed here.
+    With commit=False (only meaningful with a given `conn`) the caller commits, so it can batch writes.
     """
-    conn = create_connection()
+    own_conn = conn is None
+    if own_conn:
+        conn = create_connection()
     if conn is None:
         return False
 
@@ -62,15 +70,15 @@ def collect_data(timestamp, user_input, intent, entities, sentiment, plugin_used
         """
         cursor = conn.cursor()
         cursor.execute(sql, (timestamp, user_input, intent, entities, sentiment, plugin_used, response, success, language))
-        conn.commit()
+        if commit or own_conn:
+            conn.commit()
         logger.info(f"Interaction data saved to database: {user_input}")
         return True
     except sqlite3.Error as e:
         logger.error(f"Error saving interaction data to database: {e}")
         return False
     finally:
-        if conn:
-            conn.commit()
+        if own_conn and conn:
             conn.close()
 
 def load_data():
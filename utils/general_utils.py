@@ -2,11 +2,44 @@
 Módulo de utilidades generales.
 """
 import json
+import os
 from datetime import datetime
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+def json_loads(data):
+    """
+    Decodifica JSON (str o bytes) usando orjson si está instalado, o el módulo json estándar si no.
+
+    Args:
+        data (str | bytes): El documento JSON, p. ej. `response.content`.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+SUPPORTED_LANGS = ("es", "en")
+
+def get_current_lang(context: dict = None, default: str = "es") -> str:
+    """
+    Devuelve el idioma de la conversación guardado en el contexto que reciben los plugins.
+
+    Args:
+        context (dict): Contexto del turno ('current_conversation_lang').
+        default (str): Idioma a usar si no hay contexto o el idioma no está soportado.
+    """
+    if not context:
+        return default
+    lang = context.get('current_conversation_lang', default)
+    return lang if lang in SUPPORTED_LANGS else default
+
 def saludo():
     """
     Devuelve un saludo apropiado según la hora del día.
@@ -33,11 +66,11 @@ def guardar_dato(ruta_archivo: str, clave: str, valor):
     datos = {}
     try:
         # Intenta leer el archivo existente
-        with open(ruta_archivo, "r", encoding='utf-8') as f:
-            datos = json.load(f)
+        with open(ruta_archivo, "rb") as f:
+            datos = json_loads(f.read())
     except FileNotFoundError:
         logger.info(f"Archivo no encontrado en '{ruta_archivo}'. Se creará uno nuevo.")
-    except json.JSONDecodeError:
+    except ValueError: # json.JSONDecodeError y orjson.JSONDecodeError derivan de ValueError
         logger.warning(f"Error al decodificar JSON de '{ruta_archivo}'. El archivo será sobrescrito con los nuevos datos.")
         datos = {} # Asegura que 'datos' sea un dict si el archivo está corrupto
     except Exception as e:
@@ -47,11 +80,25 @@ def guardar_dato(ruta_archivo: str, clave: str, valor):
 
     datos[clave] = valor
 
+    ruta_temporal = f"{ruta_archivo}.tmp"
     try:
-        # Escribe los datos (actualizados o nuevos) al archivo
-        with open(ruta_archivo, "w", encoding='utf-8') as f:
-            json.dump(datos, f, indent=4, ensure_ascii=False)
+        # Escribe los datos en un archivo temporal y lo intercambia con el original,
+        # así una interrupción a mitad de escritura nunca deja el JSON truncado.
+        # Ambas ramas usan sangría de 2 espacios para que el archivo no cambie según la librería instalada.
+        if ORJSON_AVAILABLE:
+            contenido = orjson.dumps(datos, option=orjson.OPT_INDENT_2)
+        else:
+            contenido = json.dumps(datos, indent=2, ensure_ascii=False).encode("utf-8")
+        with open(ruta_temporal, "wb") as f:
+            f.write(contenido)
+        os.replace(ruta_temporal, ruta_archivo)
         logger.info(f"Dato '{clave}' guardado/actualizado en '{ruta_archivo}'.")
     except Exception as e:
         logger.error(f"Error guardando datos en '{ruta_archivo}': {e}")
+        try:
+            os.remove(ruta_temporal) # No dejar el temporal a medias junto al archivo original
+        except FileNotFoundError:
+            pass
+        except OSError as e_tmp:
+            logger.warning(f"No se pudo eliminar el archivo temporal '{ruta_temporal}': {e_tmp}")
         # Considerar si se debe levantar una excepción aquí para notificar al llamador del fallo.
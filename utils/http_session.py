@@ -0,0 +1,42 @@
+"""
+Módulo con la creación de sesiones HTTP compartidas para los plugins que consultan APIs externas.
+"""
+import functools
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (conexión, lectura): fallar rápido si el host no responde, pero dar margen a la respuesta
+DEFAULT_TIMEOUT = (3.05, 10)
+
+def create_session(pool_connections: int = 2, pool_maxsize: int = 4, retries: int = 2) -> requests.Session:
+    """
+    Crea una sesión `requests` con pool de conexiones acotado y reintentos ante errores transitorios.
+
+    Reutilizar la sesión mantiene viva la conexión HTTPS con la API entre consultas,
+    evitando un nuevo handshake TCP+TLS en cada petición.
+
+    Args:
+        pool_connections (int): Número de hosts distintos cuyo pool se conserva.
+        pool_maxsize (int): Conexiones keep-alive máximas por host.
+        retries (int): Reintentos ante errores de conexión o respuestas 502/503/504.
+    """
+    retry = Retry(total=retries, backoff_factor=0.2, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    # Las APIs consultadas responden JSON; pedir gzip explícitamente reduce los bytes transferidos
+    session.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip"})
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=1)
+def get_shared_session() -> requests.Session:
+    """
+    Devuelve la sesión HTTP común del proceso, creándola en la primera llamada.
+
+    Los plugins la comparten para que reinstanciarlos (p. ej. al recargar plugins)
+    no abra pools de conexiones nuevos.
+    """
+    return create_session(pool_connections=4, pool_maxsize=10)
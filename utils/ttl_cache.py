@@ -0,0 +1,55 @@
+"""
+Módulo con una caché en memoria con expiración por tiempo (TTL).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """
+    Caché LRU acotada cuyas entradas expiran tras `ttl` segundos.
+
+    Pensada para respuestas de APIs externas (clima, noticias) que cambian en
+    minutos: una consulta repetida dentro de la ventana se sirve desde memoria
+    en lugar de repetir la petición HTTP.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300):
+        """
+        Args:
+            maxsize (int): Número máximo de entradas; se descarta la menos usada.
+            ttl (float): Segundos que una entrada se considera válida.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Devuelve el valor almacenado para `key` si no ha expirado."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            stored_at, value = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Almacena `value` para `key`, descartando la entrada más antigua si se supera `maxsize`."""
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Vacía la caché."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)